@@ -34,7 +34,7 @@ is the `make_all` method of the Cap and CodeBuilder classes.
 """
 
 from types import MappingProxyType
-from typing import Optional
+from typing import Optional, TextIO
 from enum import Enum
 from dataclasses import dataclass
 
@@ -52,18 +52,26 @@ class Emitter:
     for example, a function declared in the 'aum' that is intended to be publicly accessible
     should have a prototype in the 'aui'.
     
-    Every file type has an associated list of emitted lines and an indentation level.
-    The class provides methods to append a line to the specific file's list with the current
+    Every file type has an associated output and an indentation level. If an output
+    stream is given for a file type, emitted lines are written to it directly as they are
+    produced; otherwise they are appended to the file's list of emitted lines.
+    The class provides methods to emit a line to the specific file with the current
     indentation for that file.
     
     Attributes
     ----------
+    c_out : Optional[TextIO]
+        The stream that lines of the 'c' file are written to, if any.
+    aui_out : Optional[TextIO]
+        The stream that lines of the 'aui' file are written to, if any.
+    aum_out : Optional[TextIO]
+        The stream that lines of the 'aum' file are written to, if any.
     emitted_c : list[str]
-        The list of emitted lines for the 'c' file.
+        The list of emitted lines for the 'c' file, if it has no output stream.
     emitted_aui : list[str]
-        The list of emitted lines for the 'aui' file.
+        The list of emitted lines for the 'aui' file, if it has no output stream.
     emitted_aum : list[str]
-        The list of emitted lines for the 'aum' file.
+        The list of emitted lines for the 'aum' file, if it has no output stream.
     indentation_c : str
         The current indentation level for the 'c' file.
     indentation_aui : str
@@ -74,16 +82,20 @@ class Emitter:
     Methods
     -------
     c(s: str) -> None
-        Append a line to the list of lines the 'c' file, prefixed with the
-        current 'c' indentation level.
+        Emit a line to the 'c' file, prefixed with the current 'c' indentation level.
     aui(s: str) -> None
-        Append a line to the list of lines the 'aui' file, prefixed with the current
-        'aui' indentation level.
+        Emit a line to the 'aui' file, prefixed with the current 'aui' indentation level.
     aum(s: str) -> None
-        Append a line to the list of lines the 'aum' file, prefixed with the current
-        'aum' indentation level.
+        Emit a line to the 'aum' file, prefixed with the current 'aum' indentation level.
     """
-    def __init__(self) -> None:
+    def __init__(self,
+                 c_out: Optional[TextIO] = None,
+                 aui_out: Optional[TextIO] = None,
+                 aum_out: Optional[TextIO] = None) -> None:
+        self.c_out: Optional[TextIO] = c_out
+        self.aui_out: Optional[TextIO] = aui_out
+        self.aum_out: Optional[TextIO] = aum_out
+
         self.emitted_c: list[str] = list()
         self.emitted_aui: list[str] = list()
         self.emitted_aum: list[str] = list()
@@ -94,39 +106,51 @@ class Emitter:
 
     def c(self, s: str) -> None:
         """
-        Append a line to the list of lines the 'c' file, prefixed with the
-        current 'c' indentation level.
+        Emit a line to the 'c' file, prefixed with the current 'c' indentation
+        level. The line is written to the output stream if there is one, and appended
+        to the list of emitted lines otherwise.
 
         Parameters
         ----------
         s: str
-            The string to append as a new line to the list.
+            The string to emit as a new line.
         """
-        self.emitted_c.append(self.indentation_c + s)
+        if self.c_out is None:
+            self.emitted_c.append(self.indentation_c + s)
+        else:
+            self.c_out.write(self.indentation_c + s + "\n")
 
     def aui(self, s: str) -> None:
         """
-        Append a line to the list of lines the 'aui' file, prefixed with the
-        current 'aui' indentation level.
+        Emit a line to the 'aui' file, prefixed with the current 'aui' indentation
+        level. The line is written to the output stream if there is one, and appended
+        to the list of emitted lines otherwise.
 
         Parameters
         ----------
         s: str
-            The string to append as a new line to the list.
+            The string to emit as a new line.
         """
-        self.emitted_aui.append(self.indentation_aui + s)
+        if self.aui_out is None:
+            self.emitted_aui.append(self.indentation_aui + s)
+        else:
+            self.aui_out.write(self.indentation_aui + s + "\n")
 
     def aum(self, s: str) -> None:
         """
-        Append a line to the list of lines the 'aum' file, prefixed with the
-        current 'aum' indentation level.
+        Emit a line to the 'aum' file, prefixed with the current 'aum' indentation
+        level. The line is written to the output stream if there is one, and appended
+        to the list of emitted lines otherwise.
 
         Parameters
         ----------
         s: str
-            The string to append as a new line to the list.
+            The string to emit as a new line.
         """
-        self.emitted_aum.append(self.indentation_aum + s)
+        if self.aum_out is None:
+            self.emitted_aum.append(self.indentation_aum + s)
+        else:
+            self.aum_out.write(self.indentation_aum + s + "\n")
 
 
 class InletSort(Enum):
@@ -1053,7 +1077,11 @@ def make_footers(emit: Emitter) -> None:
     emit.aui("end module.")
     emit.aum("end module body.")
 
-def generate_api(the_registry: Registry, the_protection_domain: ProtectionDomain) -> Emitter:
+def generate_api(the_registry: Registry,
+                 the_protection_domain: ProtectionDomain,
+                 c_out: Optional[TextIO] = None,
+                 aui_out: Optional[TextIO] = None,
+                 aum_out: Optional[TextIO] = None) -> Emitter:
     """
     Generates and returns an Austral programming language API based on the seL4 Core Platform
     system specification given in the Registry.
@@ -1063,8 +1091,9 @@ def generate_api(the_registry: Registry, the_protection_domain: ProtectionDomain
     from the registry, then uses an `Emitter` object to generate the corresponding code for all
     the inlet and memory capabilities and adds the headers and footers.
 
-    The final `Emitter` object is then returned, which can be used to output the generated code
-    to the corresponding files later.
+    Code for each file is streamed to the corresponding output stream, if one is given.
+    The final `Emitter` object is then returned, which holds the generated code for any
+    file that was not given an output stream.
 
     Parameters
     ----------
@@ -1075,6 +1104,9 @@ def generate_api(the_registry: Registry, the_protection_domain: ProtectionDomain
     the_protection_domain : ProtectionDomain
         The protection domain for which the API is to be generated.
 
+    c_out, aui_out, aum_out : Optional[TextIO]
+        Streams that the generated 'c', 'aui' and 'aum' code is written to, respectively.
+
     Returns
     -------
     Emitter
@@ -1090,11 +1122,11 @@ def generate_api(the_registry: Registry, the_protection_domain: ProtectionDomain
     for current_inlet in target_inlets:
 
         # check if this inlet leads to a communication channel
-        other_ends: list[frozenset[Inlet]] = \
-          [cc.inlets - set([current_inlet]) for cc in the_registry.comm_channels if current_inlet in cc.inlets ]
+        other_ends: list[list[Inlet]] = \
+          [[i for i in cc.inlets if i != current_inlet] for cc in the_registry.comm_channels if current_inlet in cc.inlets ]
         if other_ends:
             # this is a comm channel
-            other_end: Inlet = list(other_ends[0])[0]
+            other_end: Inlet = other_ends[0][0]
             other_pd: ProtectionDomain = other_end.protection_domain
             callable = \
               the_registry.priority_by_protection_domain[current_pd] < \
@@ -1124,7 +1156,7 @@ def generate_api(the_registry: Registry, the_protection_domain: ProtectionDomain
         memory_caps.append(MemoryCap(mmr.name, mmr.address, mmr.size, mmr.writable, mmr.patch_symbol))
 
     # 3. emit code
-    emit: Emitter = Emitter()
+    emit: Emitter = Emitter(c_out, aui_out, aum_out)
     make_headers(emit)
     InletCodeBuilder(tuple(inlet_caps)).make_all(emit)
     MemoryCodeBuilder(tuple(memory_caps)).make_all(emit)
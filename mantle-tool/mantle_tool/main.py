@@ -3,16 +3,27 @@
 # SPDX-License-Identifier: BSD-3-Clause
 #
 
-from typing import (Union, Optional)
+from typing import (Union, Optional, TextIO)
 from dataclasses import dataclass
 
 import argparse
+import contextlib
+import heapq
+import os
+import shutil
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from mantle_tool.registry import (ProtectionDomain, Registry)
 from mantle_tool.parse_sdf import (sdf_file_to_registry, RegistryError)
-from mantle_tool.codegen import (Emitter, generate_api)
+from mantle_tool.codegen import generate_api
+
+
+# The buffer size used when writing generated output files.
+OUTPUT_BUFFER_SIZE: int = 1 << 20
 
 
 def main() -> None:
@@ -26,51 +37,116 @@ def main() -> None:
                         help="output file for generated Austral module")
     parser.add_argument("-g", "--generate-api", metavar="PD_NAME",
                         type=str, help="generate an API for the given protection domain")
-    parser.add_argument("input_file", type=str,
-                        help="the input System Description File")
+    parser.add_argument("input_file", type=str, nargs="+",
+                        help="the input System Description File(s); when several are given, "
+                        "each output file name must contain '{stem}', which is replaced by "
+                        "the name of the corresponding input file without its suffix")
     args = parser.parse_args()
 
+    if len(args.input_file) == 1:
+        sys.exit(process_sdf(args, args.input_file[0]))
+
+    # batch mode: the input files are independent, so we process them in parallel
+    output_files: list[Optional[str]] = [args.output_c, args.output_aui, args.output_aum]
+    if any(f is not None and "{stem}" not in f for f in output_files):
+        parser.error("output file names must contain '{stem}' when several input files are given")
+    if any(f is not None for f in output_files):
+        # input files with the same stem would be written to the same output files
+        stem_counts: Counter[str] = Counter(Path(f).stem for f in args.input_file)
+        duplicate_stems: list[str] = [stem for (stem, count) in stem_counts.items() if count > 1]
+        if duplicate_stems:
+            parser.error("several input files have the same name (without suffix): %s"
+                         % ", ".join(repr(stem) for stem in duplicate_stems))
+    with ProcessPoolExecutor() as executor:
+        exit_codes: list[int] = \
+            list(executor.map(partial(process_sdf, args), args.input_file))
+    sys.exit(max(exit_codes))
+
+
+def process_sdf(args: argparse.Namespace, input_file: str) -> int:
+    """Run process_sdf_or_die on the given input file, returning its exit code."""
+    try:
+        process_sdf_or_die(args, input_file)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def process_sdf_or_die(args: argparse.Namespace, input_file: str) -> None:
     # generate a registry from the given SDF
-    registry: Registry = parse_registry_or_die(args.input_file)
+    registry: Registry = parse_registry_or_die(Path(input_file))
 
     if not args.generate_api:
         # If the user didn't ask us to generate anything, we just error-check the SDF
         # file. Since we reached this point, there were no errors, and we can exit.
         sys.exit(0)
 
-    # generate API
     target: ProtectionDomain = find_target_or_die(registry, args.generate_api)
-    api: Emitter = generate_api(registry, target)
-
-    # write outputs
-    # TODO: better error reporting here
 
     if not (args.output_c or args.output_aui or args.output_aum):
-        error_print("[WARN] An API was generated but no output was requested.")
+        # there is nowhere to write the API to, so we don't bother generating it
+        error_print("[WARN] An API was requested but no output was specified.")
         sys.exit(0)
 
-    if args.output_c:
-        with open(args.output_c, "w") as c_file:
-            for line in api.emitted_c:
-                c_file.write(line)
-                c_file.write("\n")
-
-    if args.output_aui:
-        with open(args.output_aui, "w") as aui_file:
-            for line in api.emitted_aui:
-                aui_file.write(line)
-                aui_file.write("\n")
-
-    if args.output_aum:
-        with open(args.output_aum, "w") as aum_file:
-            for line in api.emitted_aum:
-                aum_file.write(line)
-                aum_file.write("\n")
+    # generate API and write outputs: the generated code is streamed into temporary files
+    # as it is emitted, and these only replace the requested files once the whole API has
+    # been generated, so a failure does not leave truncated outputs behind
+    # TODO: better error reporting here
+    # '{stem}' in output file names only stands for the input file name in batch mode
+    stem: Optional[str] = Path(input_file).stem if len(args.input_file) > 1 else None
+    replacements: list[tuple[str, str]] = []
+    try:
+        with contextlib.ExitStack() as stack:
+            c_file: Optional[TextIO] = open_output(stack, replacements, args.output_c, stem)
+            aui_file: Optional[TextIO] = open_output(stack, replacements, args.output_aui, stem)
+            aum_file: Optional[TextIO] = open_output(stack, replacements, args.output_aum, stem)
+            generate_api(registry, target, c_file, aui_file, aum_file)
+        for (temporary_name, file_name) in replacements:
+            os.replace(temporary_name, file_name)
+    finally:
+        # only left over if generating or replacing failed
+        for (temporary_name, _) in replacements:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary_name)
 
     # all requested output was successful, we can exit
     sys.exit(0)
 
 
+def open_output(stack: contextlib.ExitStack, replacements: list[tuple[str, str]],
+                file_name: Optional[str], stem: Optional[str]) -> Optional[TextIO]:
+    """
+    Open a temporary file for the given output file (if any), replacing '{stem}' in its
+    name by the given input file stem (if any). The file is closed when the given stack is
+    unwound.
+
+    The temporary file is created next to the file that the output name resolves to (after
+    following symlinks), so that it can replace that file atomically while keeping its
+    permissions; the (temporary name, output name) pair is appended to replacements.
+    Outputs that are not regular files, such as /dev/stdout, and outputs in directories
+    where no temporary file can be created are opened directly instead.
+    """
+    if not file_name:
+        return None
+    if stem is not None:
+        file_name = file_name.replace("{stem}", stem)
+    # Generated files are written in many small pieces, so we buffer generously to make
+    # sure that most outputs reach the OS in a single write.
+    if os.path.exists(file_name) and not os.path.isfile(file_name):
+        return stack.enter_context(open(file_name, "w", buffering=OUTPUT_BUFFER_SIZE))
+    file_name = os.path.realpath(file_name)
+    temporary_name: str = f"{file_name}.{os.getpid()}.tmp"
+    try:
+        output: TextIO = open(temporary_name, "w", buffering=OUTPUT_BUFFER_SIZE)
+    except PermissionError:
+        return stack.enter_context(open(file_name, "w", buffering=OUTPUT_BUFFER_SIZE))
+    stack.enter_context(output)
+    replacements.append((temporary_name, file_name))
+    if os.path.exists(file_name):
+        shutil.copymode(file_name, temporary_name)
+    return output
+
+
 def error_print(*args, **kwargs):
     print(*args, file=sys.stderr, **kwargs)
 
@@ -92,9 +168,9 @@ def parse_registry_or_die(input_file: Path) -> Registry:
 
 
 def find_target_or_die(registry: Registry, target: str) -> ProtectionDomain:
-    possible_targets: list[ProtectionDomain] = \
-        [pd for pd in registry.protection_domains if pd.name == target]
-    if not possible_targets:
+    target_pd: Optional[ProtectionDomain] = \
+        registry.protection_domain_by_name.get(target)
+    if target_pd is None:
         error_print(
             "[ERROR] Target protection domain not found: '{name}'.".format(name=target))
         error_print("")
@@ -103,14 +179,14 @@ def find_target_or_die(registry: Registry, target: str) -> ProtectionDomain:
 
         # suggest 3 names of similar length (potential typos)
         suggestions: list[str] = \
-            [pd.name for pd in registry.protection_domains]
-        suggestions.sort(key=lambda x: abs(len(x) - len(target)))
+            heapq.nsmallest(3, (pd.name for pd in registry.protection_domains),
+                            key=lambda x: abs(len(x) - len(target)))
 
         hint: str = \
-            "Hint: Did you mean one of %s?" % suggestions[:3]
+            "Hint: Did you mean one of %s?" % suggestions
         error_print(hint)
         sys.exit(1)
-    return possible_targets[0]
+    return target_pd
 
 
 if __name__ == "__main__":
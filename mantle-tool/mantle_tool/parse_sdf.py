@@ -13,10 +13,11 @@ and provides functions that transform the resulting SystemDescription object
 ntto an actual validated Registry.
 """
 
-from typing import (Union, Optional)
+from typing import (Union, Optional, Iterable, Iterator)
 
 from types import MappingProxyType
 
+from itertools import chain
 from pathlib import Path
 import os
 
@@ -82,6 +83,41 @@ class SDFParseError:
 RegistryError = Union[SDFParseError, ValidationError]
 
 
+def _inlet(inlets: dict[tuple[ProtectionDomain, int], Inlet],
+           protection_domain: ProtectionDomain, number: int) -> Inlet:
+    # Inlets are frozen, so the same instance can be shared between all the IRQs and
+    # channel ends of an SDF that refer to it. The given dict holds the inlets created so far.
+    inlet: Optional[Inlet] = inlets.get((protection_domain, number))
+    if inlet is None:
+        inlet = Inlet(protection_domain, number)
+        inlets[(protection_domain, number)] = inlet
+    return inlet
+
+
+def _mapped_memory_regions(pds: Iterable[tuple[ProtectionDomain, SysProtectionDomain]],
+                           mmr_size_by_name: dict[str, int]) -> Iterator[MappedMemoryRegion]:
+    for (pd, system_pd) in pds:
+        for (mr, vaddr, perms, setvar_vaddr) in \
+                zip(system_pd.map_mrs, system_pd.map_vaddrs,
+                    system_pd.map_perms, system_pd.map_setvar_vaddrs):
+            size: Optional[int] = mmr_size_by_name.get(mr)
+            if size is None:
+                continue
+            writable: bool = 'w' in perms
+            yield MappedMemoryRegion(mr, pd, vaddr, size, writable, setvar_vaddr)
+
+
+def _comm_channels(system_channels: Iterable[SysChannel],
+                   pd_by_name: dict[str, ProtectionDomain],
+                   inlets: dict[tuple[ProtectionDomain, int], Inlet]) -> Iterator[CommChannel]:
+    for system_channel in system_channels:
+        # channel ends naming an undeclared protection domain are kept, so that
+        # validation can report them
+        yield CommChannel(tuple(_inlet(inlets, pd_by_name.get(name) or ProtectionDomain(name), number)
+                                for (name, number) in
+                                zip(system_channel.end_pds, system_channel.end_ids)))
+
+
 def system_description_to_registry(the_system_desc: SystemDescription, input_filename: Optional[str] = None) -> Union[Registry, list[ValidationError]]:
     """
     Transform a SystemDescription parsed by sysxml into a Registry, performing validation checks.
@@ -113,52 +149,37 @@ def system_description_to_registry(the_system_desc: SystemDescription, input_fil
     description: str = "parsed from %s" % the_system_desc
     if input_filename:
         description = "parsed from %s" % input_filename
-    protection_domains: set[ProtectionDomain] = set()
-    protection_domains_providing_ppcall: set[ProtectionDomain] = set()
-    inlets: set[Inlet] = set()
-    comm_channels: set[CommChannel] = set()
-    irq_channels: set[IRQChannel] = set()
-    mapped_memory_regions: set[MappedMemoryRegion] = set()
-    priority_by_protection_domain: dict[ProtectionDomain, int] = dict()
-
-    mmr_size_by_name: dict[str, int] = dict()
-    for system_mr in the_system_desc.memory_regions:
-        mmr_size_by_name[system_mr.name] = system_mr.size
-
-    for system_pd in the_system_desc.protection_domains:
-        pd: ProtectionDomain = \
-            ProtectionDomain(system_pd.name)
-        protection_domains.add(pd)
-        priority_by_protection_domain[pd] = system_pd.priority
-        if system_pd.pp:
-            protection_domains_providing_ppcall.add(pd)
-        for system_irq in system_pd.irqs:
-            inlet: Inlet = Inlet(pd, system_irq.id_)
-            inlets.add(inlet)
-            irq_channel = IRQChannel(system_irq.irq, inlet)
-            irq_channels.add(irq_channel)
-        for system_map in system_pd.maps:
-            if system_map.mr in mmr_size_by_name.keys():
-                address: int = system_map.vaddr
-                size: int = mmr_size_by_name[system_map.mr]
-                writable: bool = True if 'w' in system_map.perms else False
-                patch_symbol: Optional[str] = system_map.setvar_vaddr
-                mmr: MappedMemoryRegion = \
-                    MappedMemoryRegion(system_map.mr, pd,
-                                       address, size, writable, patch_symbol)
-                mapped_memory_regions.add(mmr)
-
-    for system_channel in the_system_desc.channels:
-        comm_channel_inlets: frozenset[Inlet] = \
-            frozenset([Inlet(ProtectionDomain(name), number)
-                      for (name, number) in system_channel.ends])
-        for ci in comm_channel_inlets:
-            inlets.add(ci)
-        comm_channels.add(CommChannel(comm_channel_inlets))
+    # Each collection is streamed straight into the frozenset held by the Registry. Channels
+    # are handled after all protection domains are known, since their ends may refer to
+    # protection domains declared later in the SDF.
+    pds: list[tuple[ProtectionDomain, SysProtectionDomain]] = \
+        [(ProtectionDomain(system_pd.name), system_pd)
+         for system_pd in the_system_desc.protection_domains]
+    pd_by_name: dict[str, ProtectionDomain] = {pd.name: pd for (pd, _) in pds}
+    mmr_size_by_name: dict[str, int] = \
+        {system_mr.name: system_mr.size for system_mr in the_system_desc.memory_regions}
+
+    # the inlets created so far, shared between the IRQ channels and the channel ends
+    inlet_by_key: dict[tuple[ProtectionDomain, int], Inlet] = {}
+    irq_channels: frozenset[IRQChannel] = \
+        frozenset(IRQChannel(irq, _inlet(inlet_by_key, pd, id_))
+                  for (pd, system_pd) in pds
+                  for (irq, id_) in zip(system_pd.irq_numbers, system_pd.irq_ids))
+    comm_channels: frozenset[CommChannel] = \
+        frozenset(_comm_channels(the_system_desc.channels, pd_by_name, inlet_by_key))
+    inlets: frozenset[Inlet] = \
+        frozenset(chain((irq_channel.inlet for irq_channel in irq_channels),
+                        (inlet for comm_channel in comm_channels for inlet in comm_channel.inlets)))
 
     registry: Registry = \
-        Registry(description, frozenset(protection_domains), frozenset(protection_domains_providing_ppcall), frozenset(inlets), frozenset(comm_channels), frozenset(irq_channels), frozenset(mapped_memory_regions), MappingProxyType(priority_by_protection_domain)
-                 )
+        Registry(description,
+                 frozenset(pd for (pd, _) in pds),
+                 frozenset(pd for (pd, system_pd) in pds if system_pd.pp),
+                 inlets,
+                 comm_channels,
+                 irq_channels,
+                 frozenset(_mapped_memory_regions(pds, mmr_size_by_name)),
+                 MappingProxyType({pd: system_pd.priority for (pd, system_pd) in pds}))
 
     validation_errors_found: list[ValidationError] = \
         validation_errors(registry)
@@ -15,14 +15,20 @@ during the subsequent analysis and code generation tasks.
 
 The module also provides utility functions and classes for checking the correctness
 of Registry objects.
+
+Registry objects are used heavily as set members and dictionary keys, so each of them
+computes its hash once, on construction. Since the hashes of strings differ between
+interpreter runs, pickled objects are rebuilt through their constructors rather than
+restored field-by-field, which recomputes the cached hash in the unpickling process.
 """
 
+import sys
 from types import MappingProxyType
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class ProtectionDomain:
     """
     Unique identifier of a specific protection domain within a Registry.
@@ -33,9 +39,29 @@ class ProtectionDomain:
         the name of the Protection Domain, as specified by the user in the SDF (English letters and underscores).
     """
     name: str
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # names are compared very often, and interned strings compare by identity
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "_hash", hash((self.name,)))
+
+    def __eq__(self, other: object) -> bool:
+        # Protection domains are usually shared by the objects that refer to them, so we
+        # try identity first. Otherwise the interned names are compared, which avoids the
+        # field tuples built by the generated __eq__.
+        if type(other) is not ProtectionDomain:
+            return NotImplemented
+        return self is other or self.name == other.name
 
+    def __hash__(self) -> int:
+        return self._hash
 
-@dataclass(frozen=True, eq=True)
+    def __reduce__(self) -> tuple[type, tuple]:
+        return (ProtectionDomain, (self.name,))
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class Inlet:
     """
     Unique identifier for a specific protection domain and channel id pair
@@ -59,23 +85,55 @@ class Inlet:
     """
     protection_domain: ProtectionDomain
     number: int
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.protection_domain, self.number)))
 
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not Inlet:
+            return NotImplemented
+        return self is other or \
+            (self.number == other.number and self.protection_domain == other.protection_domain)
 
-@dataclass(frozen=True, eq=True)
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type, tuple]:
+        return (Inlet, (self.protection_domain, self.number))
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class CommChannel:
     """
     A communication channel between two protection domains, identified uniquely
     by the two inlets it connects.
 
+    The inlets may be given as any iterable: they are stored without duplicates, in
+    canonical order, so that two channels connecting the same inlets compare equal.
+
     Attributes
     ----------
-    inlets : frozenset[Inlet]
-        a two-element set containing the inlets (ends) associated with the channel
+    inlets : tuple[Inlet, ...]
+        the inlets (ends) associated with the channel, sorted by protection domain name
+        and inlet number; a valid channel has exactly two
     """
-    inlets: frozenset[Inlet]
+    inlets: tuple[Inlet, ...]
+    _hash: int = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "inlets", tuple(sorted(
+            set(self.inlets), key=lambda i: (i.protection_domain.name, i.number))))
+        object.__setattr__(self, "_hash", hash((self.inlets,)))
 
-@dataclass(frozen=True, eq=True)
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type, tuple]:
+        return (CommChannel, (self.inlets,))
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class IRQChannel:
     """
     A pseudo-channel connecting an Inlet to notifications from a system IRQ.
@@ -93,9 +151,19 @@ class IRQChannel:
     """
     irq: int
     inlet: Inlet
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.irq, self.inlet)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type, tuple]:
+        return (IRQChannel, (self.irq, self.inlet))
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class MappedMemoryRegion:
     """
     A contiguous region of memory that will be mapped into the the virtual address
@@ -124,9 +192,25 @@ class MappedMemoryRegion:
     size: int
     writable: bool
     patch_symbol: Optional[str]
+    _hash: int = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "name", sys.intern(self.name))
+        if self.patch_symbol is not None:
+            object.__setattr__(self, "patch_symbol", sys.intern(self.patch_symbol))
+        object.__setattr__(self, "_hash", hash(
+            (self.name, self.protection_domain, self.address,
+             self.size, self.writable, self.patch_symbol)))
 
-@dataclass(frozen=True, eq=True)
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type, tuple]:
+        return (MappedMemoryRegion, (self.name, self.protection_domain, self.address,
+                                     self.size, self.writable, self.patch_symbol))
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class Registry:
     """
     A description of all the seL4 Core Platform objects and properties relevant
@@ -163,6 +247,17 @@ class Registry:
 
     priority_by_protection_domain: MappingProxyType[ProtectionDomain, int]
         An immutable dictionary that associates each protection domain to its priority level.
+
+    protection_domain_by_name: MappingProxyType[str, ProtectionDomain]
+        An immutable dictionary that associates each protection domain's name to the protection
+        domain itself. Computed from protection_domains when the Registry is created.
+
+    Methods
+    -------
+    inlet_number_range(pd: ProtectionDomain) -> Optional[tuple[int, int]]
+        The smallest and largest inlet numbers in use by the given protection domain.
+    irq_channels_targeting(irq: int) -> tuple[IRQChannel, ...]
+        The IRQ channels that target the given IRQ number.
     """
     description: str
     protection_domains: frozenset[ProtectionDomain]
@@ -172,18 +267,58 @@ class Registry:
     irq_channels: frozenset[IRQChannel]
     mapped_memory_regions: frozenset[MappedMemoryRegion]
     priority_by_protection_domain: MappingProxyType[ProtectionDomain, int]
+    protection_domain_by_name: MappingProxyType[str, ProtectionDomain] = \
+        field(init=False, repr=False, compare=False)
+    # The smallest and largest inlet numbers in use by each protection domain. These are only
+    # needed when reporting errors, so they are computed on first use.
+    _inlet_number_ranges: Optional[dict[ProtectionDomain, tuple[int, int]]] = \
+        field(default=None, init=False, repr=False, compare=False)
+    # The IRQ channels targeting each IRQ number, also computed on first use.
+    _irq_channels_by_irq: Optional[dict[int, tuple[IRQChannel, ...]]] = \
+        field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "protection_domain_by_name", MappingProxyType(
+            {pd.name: pd for pd in self.protection_domains}))
+
+    def inlet_number_range(self, pd: ProtectionDomain) -> Optional[tuple[int, int]]:
+        """
+        Return the smallest and largest numbers of the inlets of the given protection domain,
+        or None if the protection domain has no inlets in this Registry.
+        """
+        ranges: Optional[dict[ProtectionDomain, tuple[int, int]]] = self._inlet_number_ranges
+        if ranges is None:
+            ranges = {}
+            for i in self.inlets:
+                lo, hi = ranges.get(i.protection_domain, (i.number, i.number))
+                ranges[i.protection_domain] = (min(lo, i.number), max(hi, i.number))
+            object.__setattr__(self, "_inlet_number_ranges", ranges)
+        return ranges.get(pd)
+
+    def irq_channels_targeting(self, irq: int) -> tuple[IRQChannel, ...]:
+        """
+        Return the IRQ channels of this Registry that target the given IRQ number, in the
+        iteration order of irq_channels.
+        """
+        index: Optional[dict[int, tuple[IRQChannel, ...]]] = self._irq_channels_by_irq
+        if index is None:
+            channels: dict[int, list[IRQChannel]] = {}
+            for ic in self.irq_channels:
+                channels.setdefault(ic.irq, []).append(ic)
+            index = {irq: tuple(ics) for irq, ics in channels.items()}
+            object.__setattr__(self, "_irq_channels_by_irq", index)
+        return index.get(irq, ())
 
     def debug_string(self) -> str:
-        line1: str = "PDs:     %s\n" % sorted(
-            [pd.name for pd in self.protection_domains])
-        line2: str = "PDs ppc: %s\n" % sorted(
-            [pd.name for pd in self.protection_domains_providing_ppcall])
-        line3: str = "Inlets:  %s\n" % sorted(
-            [(i.protection_domain.name, i.number) for i in self.inlets])
-        line4: str = "commch:  %s\n" % sorted([(list(c.inlets)[0].protection_domain.name, list(c.inlets)[0].number, list(
-            c.inlets)[1].number, list(c.inlets)[1].protection_domain.name) for c in self.comm_channels])
-        line5: str = "irqch:   %s\n" % sorted(
-            [(i.inlet.protection_domain.name, i.inlet.number, i.irq) for i in self.irq_channels])
-        line6: str = "mmrs:    %s\n" % sorted(
-            [(mmr.protection_domain.name, mmr.name) for mmr in self.mapped_memory_regions])
-        return (line1 + line2 + line3 + line4 + line5 + line6)
+        lines: tuple[str, ...] = (
+            "PDs:     %s\n" % sorted(pd.name for pd in self.protection_domains),
+            "PDs ppc: %s\n" % sorted(pd.name for pd in self.protection_domains_providing_ppcall),
+            "Inlets:  %s\n" % sorted((i.protection_domain.name, i.number) for i in self.inlets),
+            "commch:  %s\n" % sorted((c.inlets[0].protection_domain.name, c.inlets[0].number,
+                                       c.inlets[1].number, c.inlets[1].protection_domain.name)
+                                      for c in self.comm_channels),
+            "irqch:   %s\n" % sorted((i.inlet.protection_domain.name, i.inlet.number, i.irq)
+                                      for i in self.irq_channels),
+            "mmrs:    %s\n" % sorted((mmr.protection_domain.name, mmr.name)
+                                      for mmr in self.mapped_memory_regions))
+        return "".join(lines)
@@ -19,15 +19,25 @@
 #   2. The validation module provides a better, more convenient error-checking mechanism
 #      for our purposes.
 
-from dataclasses import dataclass
+import array
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-# See: https://stackoverflow.com/questions/6949395/is-there-a-way-to-get-a-line-number-from-an-elementtree-element
-# Force use of Python elementtree to avoid overloading
+import os
 import sys
-sys.modules['_elementtree'] = None  # type: ignore
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
 
-from typing import Dict, Iterable, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+# lxml is an optional, C-backed parser with an ElementTree-compatible API. We use it
+# when it is installed, and fall back to the standard library parser otherwise.
+# Versions of lxml before 5.0 cannot resolve internal entities without also resolving
+# external ones, so we only use lxml 5.0 and later.
+try:
+    from lxml import etree as LET  # type: ignore
+    HAVE_LXML = LET.LXML_VERSION >= (5, 0)
+except ImportError:
+    HAVE_LXML = False
 
 class MissingAttribute(Exception):
     def __init__(self, attribute_name: str, element: ET.Element):
@@ -35,47 +45,151 @@ class MissingAttribute(Exception):
         self.attribute_name = attribute_name
         self.element = element
 
-def checked_lookup(el: ET.Element, attr: str) -> str:
-    try:
-        return el.attrib[attr]
-    except KeyError:
-        raise MissingAttribute(attr, el)
-
-
-def _check_attrs(el: ET.Element, valid_keys: Iterable[str]) -> None:
-    for key in el.attrib:
-        if key not in valid_keys:
-            raise ValueError(f"invalid attribute '{key}'")
+# The xml2* functions below bind each element's attribute mapping once and index it directly;
+# a KeyError raised by a missing required attribute is converted into a MissingAttribute.
+# Errors in child elements are caught by a single handler around the whole loop over the
+# children, which reports the child that was being processed.
+# Numeric attributes are parsed with int(s, 0), which accepts 0x/0o/0b prefixes; the base
+# is passed positionally, which CPython handles faster than the base=0 keyword.
+# Names of memory regions and protection domains are interned, so that the many references
+# to the same name share a single string.
+
+_MR_ATTRS = frozenset({"name", "size", "page_size", "phys_addr"})
+_PD_ATTRS = frozenset({"name", "priority", "pp", "budget", "period"})
+_MAP_ATTRS = frozenset({"mr", "vaddr", "perms", "cached", "setvar_vaddr"})
+_IRQ_ATTRS = frozenset({"irq", "id"})
+_SETVAR_ATTRS = frozenset({"symbol", "region_paddr"})
+_CHANNEL_ATTRS: frozenset[str] = frozenset()
+_END_ATTRS = frozenset({"pd", "id"})
+
+def _check_attrs(attrib: Dict[str, str], valid_keys: frozenset[str]) -> None:
+    if not attrib:
+        # common for elements without required attributes, e.g. <channel>
+        return
+    if not valid_keys.issuperset(attrib):
+        # report the first invalid attribute in document order
+        key = next(key for key in attrib if key not in valid_keys)
+        raise ValueError(f"invalid attribute '{key}'")
+
+# Booleans are case-insensitive; the common spellings are looked up without lowercasing.
+_BOOL_VALUES: Dict[str, bool] = {"true": True, "false": False, "True": True, "False": False}
 
 def str_to_bool(the_string: str) -> bool:
-    if the_string.lower() == "false":
-        return False
-    if the_string.lower() == "true":
-        return True
-    raise ValueError("Invalid boolean value")
-
-@dataclass(frozen=True, eq=True)
+    value = _BOOL_VALUES.get(the_string)
+    if value is None:
+        value = _BOOL_VALUES.get(the_string.lower())
+        if value is None:
+            raise ValueError("Invalid boolean value")
+    return value
+
+@dataclass(frozen=True, eq=True, slots=True)
 class PlatformDescription:
     page_sizes: Tuple[int, ...]
 
 def default_platform_description() -> PlatformDescription:
     return PlatformDescription(page_sizes = (0x1_000, 0x200_000))
 
-class LineNumberingParser(ET.XMLParser):
-    def __init__(self, path: Path):
-        super().__init__()
-        self._path = path
-
-    def _start(self, *args, **kwargs):  # type: ignore
-        element = super(self.__class__, self)._start(*args, **kwargs)
-        element._path = self._path
-        element._start_line_number = self.parser.CurrentLineNumber
-        element._start_column_number = self.parser.CurrentColumnNumber
-        element._loc_str = f"{element._path}:{element._start_line_number}.{element._start_column_number}"
-        return element
-
+class LocatedElement(ET.Element):
+    """An element that remembers where its start tag occurs in its source file."""
+    __slots__ = ("path", "line", "column")
+    path: Path
+    line: int
+    column: int
+
+
+def loc(el: ET.Element) -> str:
+    """Return a 'path:line.column' description of where the element occurs in its source."""
+    if not isinstance(el, LocatedElement):
+        # lxml tracks source lines natively, but does not keep track of columns; such
+        # descriptions never reach the user, see xml2system
+        return f"{el.base}:{el.sourceline}"  # type: ignore
+    return f"{el.path}:{el.line}.{el.column}"
+
+
+def _qualified_name(name: str) -> str:
+    """Convert a name reported by expat as "uri}name" to ElementTree's "{uri}name" form."""
+    return "{" + name if "}" in name else name
+
+
+def _iterparse(filename: Path, use_lxml: bool) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream the ("start", element) and ("end", element) events of the given XML file, parsed
+    with lxml if use_lxml is set, and with the standard library parser otherwise.
+    """
+    if use_lxml:
+        # Given a file name, libxml2 reads the file itself instead of going through a Python
+        # file object, and records the name as given as each element's base. Since it reports
+        # a missing file as a generic OSError, we check that the file exists first.
+        os.stat(filename)
+        try:
+            # External entities are not resolved and network access is disabled, to rule
+            # out XXE attacks. References to external entities are left in the tree as
+            # entity nodes, which are rejected as invalid elements.
+            yield from LET.iterparse(str(filename), events=("start", "end"),
+                                     resolve_entities="internal", no_network=True,
+                                     remove_comments=True, remove_pis=True)
+        except LET.XMLSyntaxError as e:
+            line, column = e.position
+            raise ValueError(f"XML parsing: error @ {filename}:{line}.{column}")
+        return
+
+    # We drive expat ourselves, rather than going through ET.iterparse, so that we can
+    # record source locations while the tree is still built by the C TreeBuilder. The
+    # parser is set up to behave like ET.XMLParser in every other respect.
+    builder = ET.TreeBuilder(element_factory=LocatedElement)
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.buffer_text = True
+    events: list[Tuple[str, Any]] = []
+    # Set once the document declares a namespace: only then can names be qualified.
+    namespaces = False
+
+    def start(tag: str, attrib: Dict[str, str]) -> None:
+        if namespaces:
+            # expat reports qualified names as "uri}name", ElementTree uses "{uri}name"
+            tag = _qualified_name(tag)
+            attrib = {_qualified_name(key): value for key, value in attrib.items()}
+        element: LocatedElement = builder.start(tag, attrib)  # type: ignore
+        element.path = filename
+        element.line = parser.CurrentLineNumber
+        element.column = parser.CurrentColumnNumber
+        events.append(("start", element))
+
+    def end(tag: str) -> None:
+        events.append(("end", builder.end(_qualified_name(tag) if namespaces else tag)))
+
+    def start_namespace(prefix: Optional[str], uri: str) -> None:
+        nonlocal namespaces
+        namespaces = True
+
+    def default(text: str) -> None:
+        # Entity references reach this handler only if expat does not expand them itself,
+        # i.e. if they are undefined or external. Such references are errors.
+        if text[:1] == "&":
+            error = expat.error(f"undefined entity {text}: line {parser.ErrorLineNumber}, "
+                                f"column {parser.ErrorColumnNumber}")
+            error.lineno = parser.ErrorLineNumber
+            error.offset = parser.ErrorColumnNumber
+            raise error
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.StartNamespaceDeclHandler = start_namespace
+    parser.CharacterDataHandler = builder.data
+    parser.DefaultHandlerExpand = default
 
-@dataclass(frozen=True, eq=True)
+    try:
+        with open(filename, "rb") as input_file:
+            while chunk := input_file.read(1 << 16):
+                parser.Parse(chunk, False)
+                yield from events
+                events.clear()
+            parser.Parse(b"", True)
+            yield from events
+    except expat.ExpatError as e:
+        raise ValueError(f"XML parsing: error @ {filename}:{e.lineno}.{e.offset}")
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class SysMap:
     mr: str
     vaddr: int
@@ -84,32 +198,70 @@ class SysMap:
     setvar_vaddr: Optional[str]
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class SysIrq:
     irq: int
     id_: int
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class SysSetVar:
     symbol: str
     region_paddr: Optional[str] = None
     vaddr: Optional[int] = None
 
 
-@dataclass(frozen=True, eq=True)
+# The maps, IRQs and setvars of a protection domain are stored column-wise, as parallel
+# tuples with one entry per map, IRQ or setvar respectively. The maps, irqs and setvars
+# properties reassemble the columns into SysMap, SysIrq and SysSetVar records on demand.
+@dataclass(frozen=True, eq=True, slots=True)
 class SysProtectionDomain:
     name: str
     priority: int
     budget: int
     period: int
     pp: bool
-    maps: Tuple[SysMap, ...]
-    irqs: Tuple[SysIrq, ...]
-    setvars: Tuple[SysSetVar, ...]
-
-
-@dataclass(frozen=True, eq=True)
+    map_mrs: Tuple[str, ...]
+    map_vaddrs: Tuple[int, ...]
+    map_perms: Tuple[str, ...]
+    map_cached: Tuple[bool, ...]
+    map_setvar_vaddrs: Tuple[Optional[str], ...]
+    irq_numbers: Tuple[int, ...]
+    irq_ids: Tuple[int, ...]
+    setvar_symbols: Tuple[str, ...]
+    setvar_region_paddrs: Tuple[Optional[str], ...]
+    setvar_vaddrs: Tuple[Optional[int], ...]
+    # Hashing a protection domain hashes every one of its columns, so the hash is computed
+    # on first use and kept. Pickling goes through the constructor, so that a hash computed
+    # in one process is never carried over into another.
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = hash(tuple(getattr(self, f.name) for f in fields(self) if f.compare))
+            object.__setattr__(self, "_hash", h)
+        return h
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        return (SysProtectionDomain, tuple(getattr(self, f.name) for f in fields(self) if f.init))
+
+    @property
+    def maps(self) -> Tuple[SysMap, ...]:
+        return tuple(map(SysMap, self.map_mrs, self.map_vaddrs, self.map_perms,
+                         self.map_cached, self.map_setvar_vaddrs))
+
+    @property
+    def irqs(self) -> Tuple[SysIrq, ...]:
+        return tuple(map(SysIrq, self.irq_numbers, self.irq_ids))
+
+    @property
+    def setvars(self) -> Tuple[SysSetVar, ...]:
+        return tuple(map(SysSetVar, self.setvar_symbols, self.setvar_region_paddrs,
+                         self.setvar_vaddrs))
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class SysMemoryRegion:
     name: str
     size: int
@@ -118,9 +270,21 @@ class SysMemoryRegion:
     phys_addr: Optional[int]
 
 
-@dataclass(frozen=True, eq=True)
+# The ends of a channel are likewise stored column-wise: a tuple of PD names, and a parallel
+# array of channel ids. Arrays are not hashable, so the hash is computed from a tuple copy.
+# Ids that do not fit in the array are invalid, but they are kept in a tuple instead, so
+# that validation can report them.
+@dataclass(frozen=True, eq=True, slots=True)
 class SysChannel:
-    ends: tuple[tuple[str,int],...]
+    end_pds: Tuple[str, ...]
+    end_ids: Sequence[int]
+
+    def __hash__(self) -> int:
+        return hash((self.end_pds, tuple(self.end_ids)))
+
+    @property
+    def ends(self) -> Tuple[Tuple[str, int], ...]:
+        return tuple(zip(self.end_pds, self.end_ids))
 
 class SystemDescription:
     def __init__(
@@ -136,138 +300,255 @@ class SystemDescription:
         if len(self.protection_domains) > 63:
             raise ValueError(f"Too many protection domains ({len(self.protection_domains)}) defined. Maximum is 63.")
 
-        for pd in protection_domains:
-            if len([pd2.name for pd2 in self.protection_domains if pd.name == pd2.name]) > 1:
+        pd_names: Set[str] = set()
+        for pd in self.protection_domains:
+            if pd.name in pd_names:
                 raise ValueError(f"Protection domain '{pd.name}' defined multiple times.")
+            pd_names.add(pd.name)
 
-        for mr in protection_domains:
-            if len([mr2.name for mr2 in self.memory_regions if mr.name == mr2.name]) > 1:
+        mr_names: Set[str] = set()
+        for mr in self.memory_regions:
+            if mr.name in mr_names:
                 raise ValueError(f"Memory region '{mr.name}' defined multiple times.")
+            mr_names.add(mr.name)
 
 
 def xml2mr(mr_xml: ET.Element, plat_desc: PlatformDescription) -> SysMemoryRegion:
-    _check_attrs(mr_xml, ("name", "size", "page_size", "phys_addr"))
-    name = checked_lookup(mr_xml, "name")
-    size = int(checked_lookup(mr_xml, "size"), base=0)
-    page_size_str = mr_xml.attrib.get("page_size")
-    page_size = min(plat_desc.page_sizes) if page_size_str is None else int(page_size_str, base=0)
+    attrib = mr_xml.attrib
+    _check_attrs(attrib, _MR_ATTRS)
+    try:
+        name = sys.intern(attrib["name"])
+        size = int(attrib["size"], 0)
+    except KeyError as e:
+        raise MissingAttribute(e.args[0], mr_xml)
+    page_size_str = attrib.get("page_size")
+    page_size = min(plat_desc.page_sizes) if page_size_str is None else int(page_size_str, 0)
     if page_size not in plat_desc.page_sizes:
         raise ValueError(f"page size 0x{page_size:x} not supported")
     if size % page_size != 0:
         raise ValueError("size is not a multiple of the page size")
-    paddr_str = mr_xml.attrib.get("phys_addr")
-    paddr = None if paddr_str is None else int(paddr_str, base=0)
+    paddr_str = attrib.get("phys_addr")
+    paddr = None if paddr_str is None else int(paddr_str, 0)
     if paddr is not None and paddr % page_size != 0:
         raise ValueError("phys_addr is not aligned to the page size")
     page_count = size // page_size
     return SysMemoryRegion(name, size, page_size, page_count, paddr)
 
 
-def xml2pd(pd_xml: ET.Element) -> SysProtectionDomain:
-    _check_attrs(pd_xml, ("name", "priority", "pp", "budget", "period"))
-    name = checked_lookup(pd_xml, "name")
-    priority = int(pd_xml.attrib.get("priority", "0"), base=0)
+class _PDColumns:
+    """The columns of a SysProtectionDomain, collected while its child elements are parsed."""
+    __slots__ = ("map_mrs", "map_vaddrs", "map_perms", "map_cached", "map_setvar_vaddrs",
+                 "irq_numbers", "irq_ids", "setvar_symbols", "setvar_region_paddrs", "setvar_vaddrs")
 
-    budget = int(pd_xml.attrib.get("budget", "1000"), base=0)
-    period = int(pd_xml.attrib.get("period", str(budget)), base=0)
+    def __init__(self) -> None:
+        self.map_mrs: list[str] = []
+        self.map_vaddrs: list[int] = []
+        self.map_perms: list[str] = []
+        self.map_cached: list[bool] = []
+        self.map_setvar_vaddrs: list[Optional[str]] = []
+        self.irq_numbers: list[int] = []
+        self.irq_ids: list[int] = []
+        self.setvar_symbols: list[str] = []
+        self.setvar_region_paddrs: list[Optional[str]] = []
+        self.setvar_vaddrs: list[Optional[int]] = []
 
-    pp = str_to_bool(pd_xml.attrib.get("pp", "false"))
 
-    maps = []
-    irqs = []
-    setvars = []
-    for child in pd_xml:
-        try:
-            if child.tag == "program_image":
-                pass
-            elif child.tag == "map":
-                _check_attrs(child, ("mr", "vaddr", "perms", "cached", "setvar_vaddr"))
-                mr = checked_lookup(child, "mr")
-                vaddr = int(checked_lookup(child, "vaddr"), base=0)
-                perms = child.attrib.get("perms", "rw")
-                cached = str_to_bool(child.attrib.get("cached", "true"))
-
-                setvar_vaddr = child.attrib.get("setvar_vaddr")
-                if setvar_vaddr:
-                    setvars.append(SysSetVar(setvar_vaddr, vaddr=vaddr))
-
-                maps.append(SysMap(mr, vaddr, perms, cached, setvar_vaddr))
-                    
-            elif child.tag == "irq":
-                _check_attrs(child, ("irq", "id"))
-                irq = int(checked_lookup(child, "irq"), base=0)
-                id_ = int(checked_lookup(child, "id"), base=0)
-                irqs.append(SysIrq(irq, id_))
-            elif child.tag == "setvar":
-                _check_attrs(child, ("symbol", "region_paddr"))
-                symbol = checked_lookup(child, "symbol")
-                region_paddr = checked_lookup(child, "region_paddr")
-                setvars.append(SysSetVar(symbol, region_paddr=region_paddr))
-            else:
-                raise ValueError(f"invalid XML element '{child.tag}': {child._loc_str}")  # type: ignore
-        except ValueError as e:
-            raise ValueError(f"{e} on element '{child.tag}': {child._loc_str}")  # type: ignore
+def _pd_program_image(columns: _PDColumns, attrib: Dict[str, str]) -> None:
+    pass
+
+
+def _pd_map(columns: _PDColumns, attrib: Dict[str, str]) -> None:
+    _check_attrs(attrib, _MAP_ATTRS)
+    mr = sys.intern(attrib["mr"])
+    vaddr = int(attrib["vaddr"], 0)
+    perms = attrib.get("perms", "rw")
+    cached_str = attrib.get("cached")
+    cached = True if cached_str is None else str_to_bool(cached_str)
+
+    setvar_vaddr = attrib.get("setvar_vaddr")
+    if setvar_vaddr:
+        columns.setvar_symbols.append(setvar_vaddr)
+        columns.setvar_region_paddrs.append(None)
+        columns.setvar_vaddrs.append(vaddr)
+
+    columns.map_mrs.append(mr)
+    columns.map_vaddrs.append(vaddr)
+    columns.map_perms.append(perms)
+    columns.map_cached.append(cached)
+    columns.map_setvar_vaddrs.append(setvar_vaddr)
+
 
-    return SysProtectionDomain(name, priority, budget, period, pp, tuple(maps), tuple(irqs), tuple(setvars))
+def _pd_irq(columns: _PDColumns, attrib: Dict[str, str]) -> None:
+    _check_attrs(attrib, _IRQ_ATTRS)
+    irq = int(attrib["irq"], 0)
+    id_ = int(attrib["id"], 0)
+    columns.irq_numbers.append(irq)
+    columns.irq_ids.append(id_)
+
+
+def _pd_setvar(columns: _PDColumns, attrib: Dict[str, str]) -> None:
+    _check_attrs(attrib, _SETVAR_ATTRS)
+    symbol = attrib["symbol"]
+    region_paddr = attrib["region_paddr"]
+    columns.setvar_symbols.append(symbol)
+    columns.setvar_region_paddrs.append(region_paddr)
+    columns.setvar_vaddrs.append(None)
+
+
+# Parsers for the child elements of a protection domain, by tag.
+_PD_CHILD_HANDLERS: Dict[str, Callable[[_PDColumns, Dict[str, str]], None]] = {
+    "program_image": _pd_program_image,
+    "map": _pd_map,
+    "irq": _pd_irq,
+    "setvar": _pd_setvar,
+}
+
+
+def xml2pd(pd_xml: ET.Element) -> SysProtectionDomain:
+    attrib = pd_xml.attrib
+    _check_attrs(attrib, _PD_ATTRS)
+    try:
+        name = sys.intern(attrib["name"])
+    except KeyError as e:
+        raise MissingAttribute(e.args[0], pd_xml)
+    # Defaults are used as they are, rather than being formatted and parsed back.
+    priority_str = attrib.get("priority")
+    priority = 0 if priority_str is None else int(priority_str, 0)
+
+    budget_str = attrib.get("budget")
+    budget = 1000 if budget_str is None else int(budget_str, 0)
+    period_str = attrib.get("period")
+    period = budget if period_str is None else int(period_str, 0)
+
+    pp_str = attrib.get("pp")
+    pp = False if pp_str is None else str_to_bool(pp_str)
+
+    columns = _PDColumns()
+    try:
+        for child in pd_xml:
+            handler = _PD_CHILD_HANDLERS.get(child.tag)
+            if handler is None:
+                raise ValueError(f"invalid XML element '{child.tag}': {loc(child)}")
+            handler(columns, child.attrib)
+    except KeyError as e:
+        raise MissingAttribute(e.args[0], child)
+    except ValueError as e:
+        raise ValueError(f"{e} on element '{child.tag}': {loc(child)}")
+
+    return SysProtectionDomain(name, priority, budget, period, pp,
+                               tuple(columns.map_mrs), tuple(columns.map_vaddrs),
+                               tuple(columns.map_perms), tuple(columns.map_cached),
+                               tuple(columns.map_setvar_vaddrs),
+                               tuple(columns.irq_numbers), tuple(columns.irq_ids),
+                               tuple(columns.setvar_symbols), tuple(columns.setvar_region_paddrs),
+                               tuple(columns.setvar_vaddrs))
 
 
 def xml2channel(ch_xml: ET.Element) -> SysChannel:
-    _check_attrs(ch_xml, ())
-    ends = []
-    for child in ch_xml:
-        try:
+    _check_attrs(ch_xml.attrib, _CHANNEL_ATTRS)
+    end_pds = []
+    end_ids = []
+    try:
+        for child in ch_xml:
+            attrib = child.attrib
             if child.tag == "end":
-                _check_attrs(ch_xml, ("pd", "id"))
-                pd = checked_lookup(child, "pd")
-                id_ = int(checked_lookup(child, "id"))
-                ends.append((pd, id_))
+                _check_attrs(attrib, _END_ATTRS)
+                pd = sys.intern(attrib["pd"])
+                id_ = int(attrib["id"])
+                end_pds.append(pd)
+                end_ids.append(id_)
             else:
-                raise ValueError(f"invalid XML element '{child.tag}': {child._loc_str}")  # type: ignore
-        except ValueError as e:
-            raise ValueError(f"{e} on element '{child.tag}': {child._loc_str}")  # type: ignore
-
-    return SysChannel(tuple(ends))
+                raise ValueError(f"invalid XML element '{child.tag}': {loc(child)}")
+    except KeyError as e:
+        raise MissingAttribute(e.args[0], child)
+    except ValueError as e:
+        raise ValueError(f"{e} on element '{child.tag}': {loc(child)}")
 
+    try:
+        ids: Sequence[int] = array.array("q", end_ids)
+    except OverflowError:
+        ids = tuple(end_ids)
+    return SysChannel(tuple(end_pds), ids)
 
 
 def _check_no_text(el: ET.Element) -> None:
-    if not (el.text is None or el.text.strip() == ""):
-        raise ValueError(f"unexpected text found in element '{el.tag}' @ {el._loc_str}")  # type: ignore
-    if not (el.tail is None or el.tail.strip() == ""):
-        raise ValueError(f"unexpected text found after element '{el.tag}' @ {el._loc_str}")  # type: ignore
+    # Called once the element has ended, i.e. when its text and the tails of its
+    # children are known.
+    text = el.text
+    if text and not text.isspace():
+        raise ValueError(f"unexpected text found in element '{el.tag}' @ {loc(el)}")
     for child in el:
-        _check_no_text(child)
+        _check_no_tail(child)
 
 
-def xml2system(filename: Path, plat_desc: PlatformDescription) -> SystemDescription:
-    try:
-        tree = ET.parse(filename, parser=LineNumberingParser(filename))
-    except ET.ParseError as e:
-        line, column = e.position
-        raise ValueError(f"XML parsing: error @ {filename}:{line}.{column}")
+def _check_no_tail(el: ET.Element) -> None:
+    tail = el.tail
+    if tail and not tail.isspace():
+        raise ValueError(f"unexpected text found after element '{el.tag}' @ {loc(el)}")
 
-    root = tree.getroot()
-    memory_regions = []
-    protection_domains = []
-    channels = []
 
-    # Ensure there is no non-whitespace text
-    _check_no_text(root)
+def xml2system(filename: Path, plat_desc: PlatformDescription) -> SystemDescription:
+    if HAVE_LXML:
+        # lxml does not keep track of columns, and its syntax error positions differ from
+        # those reported by expat. Errors are rare, so whenever lxml rejects a file, we parse
+        # it again with the standard library parser, which reports the precise location of
+        # the error. This way, the results never depend on whether lxml is installed.
+        try:
+            return _xml2system(filename, plat_desc, True)
+        except ValueError:
+            pass
+    return _xml2system(filename, plat_desc, False)
+
+
+def _xml2system(filename: Path, plat_desc: PlatformDescription, use_lxml: bool) -> SystemDescription:
+    memory_regions: list[SysMemoryRegion] = []
+    protection_domains: list[SysProtectionDomain] = []
+    channels: list[SysChannel] = []
+    # Converters for the top-level elements of the SDF, by tag.
+    converters: Dict[str, Callable[[ET.Element], None]] = {
+        "memory_region": lambda el: memory_regions.append(xml2mr(el, plat_desc)),
+        "protection_domain": lambda el: protection_domains.append(xml2pd(el)),
+        "channel": lambda el: channels.append(xml2channel(el)),
+    }
+
+    # The document is streamed: each top-level element is converted as soon as it has
+    # been parsed, then cleared and detached from the root afterwards, so the full tree
+    # is never held in memory.
+    root: Any = None
+    previous = None
+    depth = 0
+    for event, child in _iterparse(filename, use_lxml):
+        if event == "start":
+            if root is None:
+                root = child
+            depth += 1
+            continue
+        depth -= 1
+
+        # Ensure there is no non-whitespace text. Every element is checked as it ends,
+        # so the document is only walked once.
+        _check_no_text(child)
+        if depth != 1:
+            continue
+
+        # Top-level elements are detached from the root as we go, so their tails have to
+        # be checked before that happens: this is done one step behind, once the next
+        # sibling has ended.
+        if previous is not None:
+            _check_no_tail(previous)
+            previous.clear()
+            root.remove(previous)
 
-    for child in root:
         try:
-            if child.tag == "memory_region":
-                memory_regions.append(xml2mr(child, plat_desc))
-            elif child.tag == "protection_domain":
-                protection_domains.append(xml2pd(child))
-            elif child.tag == "channel":
-                channels.append(xml2channel(child))
-            else:
-                raise ValueError(f"invalid XML element '{child.tag}' @ {child._loc_str}")  # type: ignore
+            converter = converters.get(child.tag)
+            if converter is None:
+                raise ValueError(f"invalid XML element '{child.tag}' @ {loc(child)}")
+            converter(child)
         except ValueError as e:
-            raise ValueError(f"{e} on element '{child.tag}' @ {child._loc_str}")  # type: ignore
+            raise ValueError(f"{e} on element '{child.tag}' @ {loc(child)}")
         except MissingAttribute as e:
-            raise ValueError(f"missing required attribute '{e.attribute_name}' on element '{e.element.tag}': {e.element._loc_str}")  # type: ignore
+            raise ValueError(f"missing required attribute '{e.attribute_name}' on element '{e.element.tag}': {loc(e.element)}")
+        previous = child
 
     return SystemDescription(
         memory_regions=memory_regions,
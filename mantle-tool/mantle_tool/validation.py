@@ -10,15 +10,93 @@ classes for producing validation errors.
 
 """
 
-from types import MappingProxyType
-from typing import (Union, Optional)
-from dataclasses import dataclass
+import heapq
+import itertools
+from functools import lru_cache, wraps
+from typing import (Callable, Iterator, Mapping, Union, Optional, TypeVar)
+from dataclasses import dataclass, field
 
 from mantle_tool.registry import (
     ProtectionDomain, Inlet, CommChannel, IRQChannel, MappedMemoryRegion, Registry)
 
 
-class InvalidProtectionDomainName:
+def similar_protection_domain_names(registry: Registry, name: str) -> list[str]:
+    """
+    Suggest the names of 3 protection domains of the given registry whose lengths are closest
+    to that of the given name (potential typos).
+    """
+    # the names are the keys of the registry's name index, so no list of them is built here
+    return heapq.nsmallest(3, registry.protection_domain_by_name,
+                           key=lambda x: abs(len(x) - len(name)))
+
+
+def format_characters(characters: frozenset[str]) -> str:
+    """Format the given set of characters for display, e.g. "' ', '-'"."""
+    return ", ".join(repr(c) for c in sorted(characters))
+
+
+def format_invalid_name_error(short_error: str, subject: str, characters: frozenset[str],
+                              registry: Registry) -> str:
+    """
+    The detailed error message shared by the errors for invalid names: short_error is the
+    error's summary, and subject describes the invalid name, e.g. "The name of this
+    protection domain contains some characters".
+    """
+    title: str = f"[ERROR] {short_error}"
+    description: str = \
+        f"{subject} ({format_characters(characters)}) that are not supported by Mantle."
+    hint: str = \
+        "Hint: You can use letters of the English alphabet, numbers and underscores. Start with a letter."
+    location: str = \
+        f"Location: {registry.description}"
+    error: str = \
+        f"{title}\n\n{description}\n{hint}\n{location}\n"
+    return error
+
+
+def format_inlets(channel: CommChannel) -> str:
+    """Format the inlets of the given communication channel for display."""
+    # the same as the repr of a list of (name, number) pairs, without building the list
+    return "[" + ", ".join(f"({i.protection_domain.name!r}, {i.number})" for i in channel.inlets) + "]"
+
+
+_E = TypeVar("_E", bound="_CachedMessages")
+
+
+def _cached_message(method: Callable[[_E], str]) -> Callable[[_E], str]:
+    """Cache the message built by the given method in the slot named after it."""
+    slot: str = "_" + method.__name__
+
+    @wraps(method)
+    def cached(self: _E) -> str:
+        message: Optional[str] = getattr(self, slot)
+        if message is None:
+            message = method(self)
+            object.__setattr__(self, slot, message)
+        return message
+    return cached
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class _CachedMessages:
+    """
+    Common base of the validation errors, holding their formatted messages once built.
+
+    Errors are immutable, so their messages never change; since format_error includes
+    the result of format_short_error, and callers often ask for both, each message is
+    built on first use and then reused.
+
+    Errors compare and hash by the problem they report: their originating_registry fields
+    are excluded, so that comparing two errors never compares whole registries.
+    """
+    _format_short_error: Optional[str] = \
+        field(default=None, init=False, repr=False, compare=False)
+    _format_error: Optional[str] = \
+        field(default=None, init=False, repr=False, compare=False)
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidProtectionDomainName(_CachedMessages):
     """
     Represents an error case where a protection domain's name contains unsupported characters.
 
@@ -32,7 +110,7 @@ class InvalidProtectionDomainName:
         The registry from which the error originated.
     invalid_protection_domain : ProtectionDomain
         The ProtectionDomain that has the invalid name.
-    invalid_chars : list[str]
+    invalid_characters : frozenset[str]
         The unsupported characters that occur in the name of the given ProtectionDomain.
 
 
@@ -44,11 +122,11 @@ class InvalidProtectionDomainName:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_protection_domain: ProtectionDomain, invalid_characters: list[str]) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_protection_domain = invalid_protection_domain
-        self.invalid_characters = invalid_characters
+    originating_registry: Registry = field(compare=False)
+    invalid_protection_domain: ProtectionDomain
+    invalid_characters: frozenset[str]
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -58,8 +136,9 @@ class InvalidProtectionDomainName:
         str
             The formatted error message.
         """
-        return "Protection domain has invalid name: '{name}'.".format(name=self.invalid_protection_domain.name)
+        return f"Protection domain has invalid name: '{self.invalid_protection_domain.name}'."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -72,22 +151,13 @@ class InvalidProtectionDomainName:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
-        description: str = \
-            "The name of this protection domain contains some characters ({chars}) that are not supported by Mantle.".format(
-                chars=self.invalid_characters)
-        hint: str = \
-            "Hint: You can use letters of the English alphabet, numbers and underscores. Start with a letter."
-        location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
-        error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
-        return error
+        return format_invalid_name_error(
+            self.format_short_error(), "The name of this protection domain contains some characters",
+            self.invalid_characters, self.originating_registry)
 
 
-class InvalidMappedMemoryRegionName:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidMappedMemoryRegionName(_CachedMessages):
     """
     Represents an error case where a mapped memory region's name contains unsupported characters.
 
@@ -101,7 +171,7 @@ class InvalidMappedMemoryRegionName:
         The registry from which the error originated.
     invalid_memory_region : MappedMemoryRegion
         The MappedMemoryRegion that has the invalid name.
-    invalid_chars : list[str]
+    invalid_characters : frozenset[str]
         The unsupported characters that occur in the name of the given MappedMemoryRegion.
 
 
@@ -113,11 +183,11 @@ class InvalidMappedMemoryRegionName:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_memory_region: MappedMemoryRegion, invalid_characters: list[str]) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_memory_region = invalid_memory_region
-        self.invalid_characters = invalid_characters
+    originating_registry: Registry = field(compare=False)
+    invalid_memory_region: MappedMemoryRegion
+    invalid_characters: frozenset[str]
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -127,8 +197,9 @@ class InvalidMappedMemoryRegionName:
         str
             The formatted error message.
         """
-        return "Mapped memory region has invalid name: '{name}'.".format(name=self.invalid_memory_region.name)
+        return f"Mapped memory region has invalid name: '{self.invalid_memory_region.name}'."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -141,22 +212,13 @@ class InvalidMappedMemoryRegionName:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
-        description: str = \
-            "The name of this memory region contains some characters ({chars}) that are not supported by Mantle.".format(
-                chars=self.invalid_characters)
-        hint: str = \
-            "Hint: You can use letters of the English alphabet, numbers and underscores. Start with a letter."
-        location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
-        error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
-        return error
+        return format_invalid_name_error(
+            self.format_short_error(), "The name of this memory region contains some characters",
+            self.invalid_characters, self.originating_registry)
 
 
-class InvalidMappedMemoryRegionPatchSymbol:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidMappedMemoryRegionPatchSymbol(_CachedMessages):
     """
     Represents an error case where a mapped memory region's patch symbol contains unsupported characters.
 
@@ -172,7 +234,7 @@ class InvalidMappedMemoryRegionPatchSymbol:
         The ProtectionDomain in which a memory region has an invalid patch symbol name
     invalid_memory_region : MappedMemoryRegion
         The MappedMemoryRegion that has the invalid patch symbol in the given ProtectionDomain.
-    invalid_chars : list[str]
+    invalid_characters : frozenset[str]
         The unsupported characters that occur in the name of the given MappedMemoryRegion.
 
 
@@ -184,12 +246,12 @@ class InvalidMappedMemoryRegionPatchSymbol:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_protection_domain: ProtectionDomain, invalid_memory_region: MappedMemoryRegion, invalid_characters: list[str]) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_protection_domain = invalid_protection_domain
-        self.invalid_memory_region = invalid_memory_region
-        self.invalid_characters = invalid_characters
+    originating_registry: Registry = field(compare=False)
+    invalid_protection_domain: ProtectionDomain
+    invalid_memory_region: MappedMemoryRegion
+    invalid_characters: frozenset[str]
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -199,8 +261,9 @@ class InvalidMappedMemoryRegionPatchSymbol:
         str
             The formatted error message.
         """
-        return "Mapped memory region has invalid patch symbol: '{ps}' in '{pd}'.".format(ps=self.invalid_memory_region.patch_symbol, pd=self.invalid_protection_domain.name)
+        return f"Mapped memory region has invalid patch symbol: '{self.invalid_memory_region.patch_symbol}' in '{self.invalid_protection_domain.name}'."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -213,22 +276,13 @@ class InvalidMappedMemoryRegionPatchSymbol:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
-        description: str = \
-            "The setvar_vaddr of this memory region contains characters ({chars}) that are not supported by Mantle.".format(
-                chars=self.invalid_characters)
-        hint: str = \
-            "Hint: You can use letters of the English alphabet, numbers and underscores. Start with a letter."
-        location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
-        error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
-        return error
+        return format_invalid_name_error(
+            self.format_short_error(), "The setvar_vaddr of this memory region contains characters",
+            self.invalid_characters, self.originating_registry)
 
 
-class InvalidInletProtectionDomain:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidInletProtectionDomain(_CachedMessages):
     """
     Represents an error case where an inlet's protection domain does not exist in the Registry.
 
@@ -250,10 +304,10 @@ class InvalidInletProtectionDomain:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_inlet: Inlet) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_inlet = invalid_inlet
+    originating_registry: Registry = field(compare=False)
+    invalid_inlet: Inlet
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -265,8 +319,9 @@ class InvalidInletProtectionDomain:
         """
         name = self.invalid_inlet.protection_domain.name
         number = self.invalid_inlet.number
-        return "Inlet's protection domain does not exist: ('{name}', {number}).".format(name=name, number=number)
+        return f"Inlet's protection domain does not exist: ('{name}', {number})."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -279,28 +334,24 @@ class InvalidInletProtectionDomain:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "The protection domain of this inlet has not been defined in this registry."
 
-        # suggest 3 names of similar length (potential typos)
         suggestions: list[str] = \
-            [pd.name for pd in self.originating_registry.protection_domains]
-        suggestions.sort(key=lambda x: abs(
-            len(x) - len(self.invalid_inlet.protection_domain.name)))
+            similar_protection_domain_names(self.originating_registry, self.invalid_inlet.protection_domain.name)
         hint: str = \
-            "Hint: Did you mean one of %s?" % suggestions[:3]
+            f"Hint: Did you mean one of {suggestions}?"
 
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidInletNumber:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidInletNumber(_CachedMessages):
     """
     Represents an error case where an inlet's number is out of the supported range.
 
@@ -322,10 +373,10 @@ class InvalidInletNumber:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_inlet: Inlet) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_inlet = invalid_inlet
+    originating_registry: Registry = field(compare=False)
+    invalid_inlet: Inlet
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -337,8 +388,9 @@ class InvalidInletNumber:
         """
         name = self.invalid_inlet.protection_domain.name
         number = self.invalid_inlet.number
-        return "Inlet's number is invalid: ('{name}', {number}).".format(name=name, number=number)
+        return f"Inlet's number is invalid: ('{name}', {number})."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -351,21 +403,20 @@ class InvalidInletNumber:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "The inlet number (channel id) of this inlet falls outside the range supported by seL4CP and Mantle."
         hint: str = \
             "Hint: The number should belong to the range 0..63, inclusive."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidCommChannelCount:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidCommChannelCount(_CachedMessages):
     """
     Represents an error case where some communication channel does not have exactly two inlets.
 
@@ -387,10 +438,16 @@ class InvalidCommChannelCount:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_comm_channel: CommChannel) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_comm_channel = invalid_comm_channel
+    originating_registry: Registry = field(compare=False)
+    invalid_comm_channel: CommChannel
+    # whether the channel has "too few" or "too many" inlets, used by both messages
+    _issue: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_issue",
+                           "too few" if len(self.invalid_comm_channel.inlets) < 2 else "too many")
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -400,13 +457,10 @@ class InvalidCommChannelCount:
         str
             The formatted error message.
         """
-        issue = "too many"
-        if len(self.invalid_comm_channel.inlets) < 2:
-            issue = "too few"
-        inlets: str = str([(i.protection_domain.name, i.number)
-                          for i in self.invalid_comm_channel.inlets])
-        return "Comm channel has {issue} inlets: {inlets}.".format(issue=issue, inlets=inlets)
+        inlets: str = format_inlets(self.invalid_comm_channel)
+        return f"Comm channel has {self._issue} inlets: {inlets}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -419,25 +473,20 @@ class InvalidCommChannelCount:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
-        issue: str = "too many"
-        if len(self.invalid_comm_channel.inlets) < 2:
-            issue = "too few"
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
-            "This communication channel connects {issue} protection domains.".format(
-                issue=issue)
+            f"This communication channel connects {self._issue} protection domains."
         hint: str = \
             "Hint: A communication channel should have exactly 2 inlets."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidCommChannelInlet:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidCommChannelInlet(_CachedMessages):
     """
     Represents an error case where a communication channel's inlet does not exist in the registry.
 
@@ -461,11 +510,11 @@ class InvalidCommChannelInlet:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_comm_channel: CommChannel, invalid_inlet: Inlet) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_comm_channel = invalid_comm_channel
-        self.invalid_inlet = invalid_inlet
+    originating_registry: Registry = field(compare=False)
+    invalid_comm_channel: CommChannel
+    invalid_inlet: Inlet
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -477,10 +526,11 @@ class InvalidCommChannelInlet:
         """
         name = self.invalid_inlet.protection_domain.name
         number = self.invalid_inlet.number
-        inlets: str = str(["(%s,%s)" % (i.protection_domain.name, i.number)
-                          for i in self.invalid_comm_channel.inlets])
-        return "Comm channel's inlet does not exist: ('{name}', {number}) in {inlets}.".format(name=name, number=number, inlets=inlets)
+        inlets: str = "[" + ", ".join(f"({i.protection_domain.name},{i.number})"
+                                      for i in self.invalid_comm_channel.inlets) + "]"
+        return f"Comm channel's inlet does not exist: ('{name}', {number}) in {inlets}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -493,28 +543,24 @@ class InvalidCommChannelInlet:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "One of the inlets of this communication channel has not been defined in this registry."
 
-        # suggest 3 names of similar length (potential typos)
         suggestions: list[str] = \
-            [pd.name for pd in self.originating_registry.protection_domains]
-        suggestions.sort(key=lambda x: abs(
-            len(x) - len(self.invalid_inlet.protection_domain.name)))
+            similar_protection_domain_names(self.originating_registry, self.invalid_inlet.protection_domain.name)
         hint: str = \
-            "Hint: Did you mean one of %s?" % suggestions[:3]
+            f"Hint: Did you mean one of {suggestions}?"
 
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidCommChannelDuplicate:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidCommChannelDuplicate(_CachedMessages):
     """
     Represents an error case where two communication channels share the same inlet in the registry.
 
@@ -538,11 +584,11 @@ class InvalidCommChannelDuplicate:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_comm_channel: CommChannel, invalid_inlet: Inlet) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_comm_channel = invalid_comm_channel
-        self.invalid_inlet = invalid_inlet
+    originating_registry: Registry = field(compare=False)
+    invalid_comm_channel: CommChannel
+    invalid_inlet: Inlet
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -554,10 +600,10 @@ class InvalidCommChannelDuplicate:
         """
         name = self.invalid_inlet.protection_domain.name
         number = self.invalid_inlet.number
-        inlets: str = str([(i.protection_domain.name, i.number)
-                          for i in self.invalid_comm_channel.inlets])
-        return "Comm channel targets an inlet already in use: ('{name}', {number}) in {inlets}.".format(name=name, number=number, inlets=inlets)
+        inlets: str = format_inlets(self.invalid_comm_channel)
+        return f"Comm channel targets an inlet already in use: ('{name}', {number}) in {inlets}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -570,40 +616,35 @@ class InvalidCommChannelDuplicate:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "This communication channel shares one of its inlets with another communication channel."
 
-        # suggest an unoccupied inlet number
-        occupied: list[int] = \
-            [i.number for i in self.originating_registry.inlets if i.protection_domain ==
-                self.invalid_inlet.protection_domain]
-        min_occupied: int = min(occupied + [63])
-        max_occupied: int = max(occupied + [0])
+        # suggest an unoccupied inlet number, next to the ones in use
+        occupied: Optional[tuple[int, int]] = \
+            self.originating_registry.inlet_number_range(self.invalid_inlet.protection_domain)
+        min_occupied: int = 63 if occupied is None else min(occupied[0], 63)
+        max_occupied: int = 0 if occupied is None else max(occupied[1], 0)
         name = self.invalid_inlet.protection_domain.name
         hint: str = \
-            "Hint: Use 'id=' to move this channel to another inlet of '{name}'.".format(
-                name=name)
+            f"Hint: Use 'id=' to move this channel to another inlet of '{name}'."
         if min_occupied > 0:
             free_inlet = min_occupied - 1
             hint = \
-                "Hint: Use 'id=' to move this channel to inlet {inlet} of '{name}'.".format(
-                    name=name, inlet=free_inlet)
+                f"Hint: Use 'id=' to move this channel to inlet {free_inlet} of '{name}'."
         if max_occupied < 63:
             free_inlet = max_occupied + 1
             hint = \
-                "Hint: Use 'id=' to move this channel to inlet {inlet} of '{name}'.".format(
-                    name=name, inlet=free_inlet)
+                f"Hint: Use 'id=' to move this channel to inlet {free_inlet} of '{name}'."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidIRQChannelInlet:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidIRQChannelInlet(_CachedMessages):
     """
     Represents an error case where an IRQ channel's inlet does not exist in the registry.
 
@@ -627,10 +668,10 @@ class InvalidIRQChannelInlet:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_irq_channel: IRQChannel) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_irq_channel = invalid_irq_channel
+    originating_registry: Registry = field(compare=False)
+    invalid_irq_channel: IRQChannel
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -640,12 +681,11 @@ class InvalidIRQChannelInlet:
         str
             The formatted error message.
         """
-        name = self.invalid_irq_channel.inlet.protection_domain.name
-        number = str(self.invalid_irq_channel.inlet.number)
-        inlet = self.invalid_irq_channel.inlet
-        irq: str = str(self.invalid_irq_channel.irq)
-        return "IRQ channel's inlet does not exist: ('{name}', {number}) for IRQ {irq}.".format(name=name, number=number, irq=irq)
+        inlet: Inlet = self.invalid_irq_channel.inlet
+        return f"IRQ channel's inlet does not exist: ('{inlet.protection_domain.name}', {inlet.number}) " \
+            f"for IRQ {self.invalid_irq_channel.irq}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -658,29 +698,24 @@ class InvalidIRQChannelInlet:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "The inlet of this IRQ channel has not been defined in this registry."
 
-        # suggest 3 names of similar length (potential typos)
         suggestions: list[str] = \
-            [pd.name for pd in self.originating_registry.protection_domains]
-        inlet = self.invalid_irq_channel.inlet
-        suggestions.sort(key=lambda x: abs(
-            len(x) - len(inlet.protection_domain.name)))
+            similar_protection_domain_names(self.originating_registry, self.invalid_irq_channel.inlet.protection_domain.name)
         hint: str = \
-            "Hint: Did you mean one of %s?" % suggestions[:3]
+            f"Hint: Did you mean one of {suggestions}?"
 
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidIRQChannelDuplicate:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidIRQChannelDuplicate(_CachedMessages):
     """
     Represents an error case where an IRQ number occurs as the target of more than one IRQ
     channel.
@@ -703,10 +738,10 @@ class InvalidIRQChannelDuplicate:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_irq_channel: IRQChannel) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_irq_channel = invalid_irq_channel
+    originating_registry: Registry = field(compare=False)
+    invalid_irq_channel: IRQChannel
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -716,12 +751,11 @@ class InvalidIRQChannelDuplicate:
         str
             The formatted error message.
         """
-        name = self.invalid_irq_channel.inlet.protection_domain.name
-        number = str(self.invalid_irq_channel.inlet.number)
-        inlet = self.invalid_irq_channel.inlet
-        irq: str = str(self.invalid_irq_channel.irq)
-        return "IRQ channel targets an IRQ already in use: ('{name}', {number}) for IRQ {irq}.".format(name=name, number=number, irq=irq)
+        inlet: Inlet = self.invalid_irq_channel.inlet
+        return f"IRQ channel targets an IRQ already in use: ('{inlet.protection_domain.name}', {inlet.number}) " \
+            f"for IRQ {self.invalid_irq_channel.irq}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -734,29 +768,27 @@ class InvalidIRQChannelDuplicate:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "This IRQ channel targets an IRQ number which is already set up to notify another inlet."
 
         # suggest irqs to remove
-        clashes: list[IRQChannel] = \
-            [ic for ic in self.originating_registry.irq_channels if ic.irq ==
-                self.invalid_irq_channel.irq]
+        clashes: tuple[IRQChannel, ...] = \
+            self.originating_registry.irq_channels_targeting(self.invalid_irq_channel.irq)
         suggestions: list[tuple[str, int]] = \
             [(ic.inlet.protection_domain.name, ic.inlet.number)
              for ic in clashes]
         hint: str = \
-            "Hint: Remove this irq from one of the following inlets: %s." % suggestions[:2]
+            f"Hint: Remove this irq from one of the following inlets: {suggestions[:2]}."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidCommAndIRQClash:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidCommAndIRQClash(_CachedMessages):
     """
     Represents an error case where a communication channel and an IRQ channel occupy
     the same inlet of a protection domain.
@@ -783,11 +815,11 @@ class InvalidCommAndIRQClash:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_comm_channel: CommChannel, invalid_irq_channel: IRQChannel) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_comm_channel = invalid_comm_channel
-        self.invalid_irq_channel = invalid_irq_channel
+    originating_registry: Registry = field(compare=False)
+    invalid_comm_channel: CommChannel
+    invalid_irq_channel: IRQChannel
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -797,14 +829,11 @@ class InvalidCommAndIRQClash:
         str
             The formatted error message.
         """
-        inlet = self.invalid_irq_channel.inlet
-        name = inlet.protection_domain.name
-        number = str(inlet.number)
-        irq: str = str(self.invalid_irq_channel.irq)
-        inlets: str = str([(i.protection_domain.name, i.number)
-                          for i in self.invalid_comm_channel.inlets])
-        return "Comm and IRQ channel occupy same inlet: ('{name}', {number}) for IRQ {irq} and {inlets}.".format(name=name, number=number, irq=irq, inlets=inlets)
+        inlet: Inlet = self.invalid_irq_channel.inlet
+        return f"Comm and IRQ channel occupy same inlet: ('{inlet.protection_domain.name}', {inlet.number}) " \
+            f"for IRQ {self.invalid_irq_channel.irq} and {format_inlets(self.invalid_comm_channel)}."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -817,23 +846,21 @@ class InvalidCommAndIRQClash:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "A communication channel and an IRQ channel notify the same inlet. This is not supported by Mantle."
         inlet = self.invalid_irq_channel.inlet
         hint: str = \
-            "Hint: Use 'id=' to set this IRQ to notify a different inlet of '{name}'.".format(
-                name=inlet.protection_domain.name)
+            f"Hint: Use 'id=' to set this IRQ to notify a different inlet of '{inlet.protection_domain.name}'."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
-class InvalidProtectionDomainPriority:
+@dataclass(frozen=True, eq=True, slots=True)
+class InvalidProtectionDomainPriority(_CachedMessages):
     """
     Represents an error case where a ProtectionDomain has no priority setting, or has
     a priority setting but it lies outside the supported range.
@@ -853,10 +880,10 @@ class InvalidProtectionDomainPriority:
         Generates a detailed, human-readable error message with troubleshooting hints.
     """
 
-    def __init__(self, originating_registry: Registry, invalid_protection_domain: ProtectionDomain) -> None:
-        self.originating_registry = originating_registry
-        self.invalid_protection_domain = invalid_protection_domain
+    originating_registry: Registry = field(compare=False)
+    invalid_protection_domain: ProtectionDomain
 
+    @_cached_message
     def format_short_error(self) -> str:
         """
         A concise, human-readable summary of the error.
@@ -867,8 +894,9 @@ class InvalidProtectionDomainPriority:
             The formatted error message.
         """
         name = self.invalid_protection_domain.name
-        return "Protection domain has invalid priority: '{name}'.".format(name=name)
+        return f"Protection domain has invalid priority: '{name}'."
 
+    @_cached_message
     def format_error(self) -> str:
         """
         A detailed, human-readable error message with troubleshooting hints.
@@ -881,17 +909,15 @@ class InvalidProtectionDomainPriority:
         str
             The formatted error message.
         """
-        title: str = "[ERROR] {title}".format(title=self.format_short_error())
+        title: str = f"[ERROR] {self.format_short_error()}"
         description: str = \
             "This protection domain has its priority set to a value that is not supported by Mantle."
         hint: str = \
             "Hint: Set the priority using 'priority=' to a value in the range 0..254 (inclusive)."
         location: str = \
-            "Location: {provenance}".format(
-                provenance=self.originating_registry.description)
+            f"Location: {self.originating_registry.description}"
         error: str = \
-            "{title}\n\n{desc}\n{hint}\n{location}\n".format(
-                title=title, desc=description, hint=hint, location=location)
+            f"{title}\n\n{description}\n{hint}\n{location}\n"
         return error
 
 
@@ -900,14 +926,21 @@ ValidationError = \
           InvalidCommChannelInlet, InvalidCommChannelDuplicate, InvalidIRQChannelInlet, InvalidIRQChannelDuplicate, InvalidCommAndIRQClash, InvalidProtectionDomainPriority]
 
 
-def name_validator(name: str) -> list[str]:
+# The same names recur often, e.g. a memory region mapped into several protection domains
+# appears once per mapping; the results are immutable, so they can be memoized.
+@lru_cache(maxsize=4096)
+def name_validator(name: str) -> frozenset[str]:
+    # ASCII identifiers are valid names unless they start with an underscore: this accepts
+    # the common case without examining each character in Python
+    if name.isascii() and name.isidentifier() and name[0] != '_':
+        return frozenset()
     if len(name) < 1:
-        return [' ']
-    violating_characters: list[str] = [
-        c for c in name if (not c.isalnum()) and c != '_']
+        return frozenset(' ')
+    violating_characters: set[str] = {
+        c for c in name if (not c.isalnum()) and c != '_'}
     if not name[0].isalpha():
-        violating_characters = [name[0]] + violating_characters
-    return violating_characters
+        violating_characters.add(name[0])
+    return frozenset(violating_characters)
 
 
 def validation_errors(registry: Registry) -> list[ValidationError]:
@@ -939,100 +972,84 @@ def validation_errors(registry: Registry) -> list[ValidationError]:
     list[ValidationError]
         A list of all validation errors found in the registry. Empty if the registry is valid.
     """
-    all_violations: list[ValidationError] = list()
+    # Each check is a generator over the registry, and the results are collected into a
+    # single list at the end, in the order of the checks below. The registry's collections
+    # are looked up once here, rather than on every iteration of the checks.
+    protection_domains: frozenset[ProtectionDomain] = registry.protection_domains
+    inlets: frozenset[Inlet] = registry.inlets
+    comm_channels: frozenset[CommChannel] = registry.comm_channels
+    irq_channels: frozenset[IRQChannel] = registry.irq_channels
+    priorities: Mapping[ProtectionDomain, int] = registry.priority_by_protection_domain
 
     # 1. check for invalid pd and mr names
-    violating_characters: list[str] = list()
-    for pd in registry.protection_domains:
-        violating_characters = name_validator(pd.name)
-        if violating_characters:
-            pd_name_violation = InvalidProtectionDomainName(
-                registry, pd, violating_characters)
-            all_violations.append(pd_name_violation)
-
-    for mr in registry.mapped_memory_regions:
-        violating_characters = name_validator(mr.name)
-        if violating_characters:
-            mr_name_violation = InvalidMappedMemoryRegionName(
-                registry, mr, violating_characters)
-            all_violations.append(mr_name_violation)
-        if mr.patch_symbol:
-            violating_characters = name_validator(mr.patch_symbol)
+    pd_name_violations: Iterator[ValidationError] = (
+        InvalidProtectionDomainName(registry, pd, violating_characters)
+        for pd in protection_domains
+        for violating_characters in (name_validator(pd.name),) if violating_characters)
+
+    # an mr's name violation is reported right before the violation of its patch symbol
+    def mr_name_violations() -> Iterator[ValidationError]:
+        for mr in registry.mapped_memory_regions:
+            violating_characters: frozenset[str] = name_validator(mr.name)
             if violating_characters:
-                mr_patch_symbol_violation = InvalidMappedMemoryRegionPatchSymbol(
-                    registry, mr.protection_domain, mr, violating_characters)
-                all_violations.append(mr_patch_symbol_violation)
+                yield InvalidMappedMemoryRegionName(registry, mr, violating_characters)
+            if mr.patch_symbol:
+                violating_characters = name_validator(mr.patch_symbol)
+                if violating_characters:
+                    yield InvalidMappedMemoryRegionPatchSymbol(
+                        registry, mr.protection_domain, mr, violating_characters)
 
     # 2. check for pds with invalid priority settings
-    pds_without_priority = \
-        [pd for pd in registry.protection_domains if not registry.priority_by_protection_domain[pd]
-         or registry.priority_by_protection_domain[pd] > 254
-         or registry.priority_by_protection_domain[pd] < 0]
-    pd_priority_violations = \
-        [InvalidProtectionDomainPriority(registry, pd)
-         for pd in pds_without_priority]
-    all_violations.extend(pd_priority_violations)
+    priority_violations: Iterator[ValidationError] = (
+        InvalidProtectionDomainPriority(registry, pd) for pd in protection_domains
+        if not 0 < priorities[pd] <= 254)
 
     # 3. check for invalid inlets
-    inlets_with_invalid_pd = \
-        [i for i in registry.inlets if not (
-            i.protection_domain in registry.protection_domains)]
-    inlet_pd_violations = \
-        [InvalidInletProtectionDomain(registry, i)
-         for i in inlets_with_invalid_pd]
-    all_violations.extend(inlet_pd_violations)
-
-    inlets_with_invalid_number = \
-        [i for i in registry.inlets if i.number < 0 or i.number > 63]
-    inlet_number_violations = \
-        [InvalidInletNumber(registry, i) for i in inlets_with_invalid_number]
-    all_violations.extend(inlet_number_violations)
+    inlet_pd_violations: Iterator[ValidationError] = (
+        InvalidInletProtectionDomain(registry, i) for i in inlets
+        if i.protection_domain not in protection_domains)
+
+    inlet_number_violations: Iterator[ValidationError] = (
+        InvalidInletNumber(registry, i) for i in inlets if not 0 <= i.number <= 63)
 
     # 4. check for invalid comm channels
-    comms_with_invalid_count = \
-        [c for c in registry.comm_channels if len(c.inlets) != 2]
-    comm_count_violations = \
-        [InvalidCommChannelCount(registry, c)
-         for c in comms_with_invalid_count]
-    all_violations.extend(comm_count_violations)
-
-    for c in registry.comm_channels:
-        comm_invalid_inlets = \
-            [i for i in c.inlets if not (i in registry.inlets)]
-        comm_inlet_violations = \
-            [InvalidCommChannelInlet(registry, c, i)
-             for i in comm_invalid_inlets]
-        all_violations.extend(comm_inlet_violations)
+    comm_count_violations: Iterator[ValidationError] = (
+        InvalidCommChannelCount(registry, c) for c in comm_channels if len(c.inlets) != 2)
 
+    # index the comm channels by their inlets, preserving the order of comm_channels
+    comm_channels_by_inlet: dict[Inlet, list[CommChannel]] = {}
+    for c in comm_channels:
         for i in c.inlets:
-            comm_invalid_duplicates = \
-                [cc for cc in registry.comm_channels if i in cc.inlets and cc != c]
-            if comm_invalid_duplicates:
-                all_violations.append(
-                    InvalidCommChannelDuplicate(registry, c, i))
+            comm_channels_by_inlet.setdefault(i, []).append(c)
+
+    # a channel's undefined inlets are reported right before its duplicated inlets
+    def comm_inlet_violations() -> Iterator[ValidationError]:
+        for c in comm_channels:
+            for i in c.inlets:
+                if i not in inlets:
+                    yield InvalidCommChannelInlet(registry, c, i)
+            for i in c.inlets:
+                # the channels are distinct, so any other channel on this inlet is a duplicate
+                if len(comm_channels_by_inlet[i]) > 1:
+                    yield InvalidCommChannelDuplicate(registry, c, i)
 
     # 5. check for invalid IRQ channels
-    irq_channel_invalid_inlets = \
-        [ic for ic in registry.irq_channels if not (
-            ic.inlet in registry.inlets)]
-    irq_channel_inlet_violations = \
-        [InvalidIRQChannelInlet(registry, ic)
-         for ic in irq_channel_invalid_inlets]
-    all_violations.extend(irq_channel_inlet_violations)
-
-    for ic in registry.irq_channels:
-        irq_channel_invalid_duplicates = \
-            [i for i in registry.irq_channels if i.irq == ic.irq and i != ic]
-        if irq_channel_invalid_duplicates:
-            all_violations.append(InvalidIRQChannelDuplicate(registry, ic))
-
-    # 6. check for IRQ/comm channel clashes
-    for ic in registry.irq_channels:
-        clashing_inlets = \
-            [(c, i) for c in registry.comm_channels for i in c.inlets if i == ic.inlet]
-        irq_comm_clash_violations = \
-            [InvalidCommAndIRQClash(registry, c, ic)
-             for (c, i) in clashing_inlets]
-        all_violations.extend(irq_comm_clash_violations)
-
-    return all_violations
+    irq_inlet_violations: Iterator[ValidationError] = (
+        InvalidIRQChannelInlet(registry, ic) for ic in irq_channels
+        if ic.inlet not in inlets)
+
+    irq_duplicate_violations: Iterator[ValidationError] = (
+        InvalidIRQChannelDuplicate(registry, ic) for ic in irq_channels
+        if len(registry.irq_channels_targeting(ic.irq)) > 1)
+
+    # 6. check for IRQ/comm channel clashes, which need both kinds of channel
+    clash_violations: Iterator[ValidationError] = (
+        InvalidCommAndIRQClash(registry, c, ic)
+        for ic in (irq_channels if comm_channels_by_inlet else ())
+        for c in comm_channels_by_inlet.get(ic.inlet, ()))
+
+    return list(itertools.chain(
+        pd_name_violations, mr_name_violations(), priority_violations,
+        inlet_pd_violations, inlet_number_violations,
+        comm_count_violations, comm_inlet_violations(),
+        irq_inlet_violations, irq_duplicate_violations, clash_violations))
@@ -19,50 +19,41 @@ def legal_name(draw):
     tail = draw(st.text(legal_tail,min_size=size,max_size=15))
     return (head + tail)
 
-@st.composite
-def legal_inlet_number(draw):
-    number = draw(st.sampled_from(range(0,63)))
-    return number
+# the inlet numbers that the generated registries may use
+LEGAL_INLET_NUMBERS = range(0,63)
 
 @st.composite
 def protection_domain(draw):
     name = draw(legal_name())
     return ProtectionDomain(str(name))
 
+def unused_inlets(existing_protection_domains, existing_comm_channels, existing_irq_channels):
+    # every legal inlet that is not yet used by a channel, in a deterministic order
+    used_inlets_comm = {inlet for channel in existing_comm_channels for inlet in channel.inlets}
+    used_inlets_irq = {channel.inlet for channel in existing_irq_channels}
+    used_inlets = used_inlets_comm | used_inlets_irq
+    return [Inlet(pd,id) for pd in existing_protection_domains for id in LEGAL_INLET_NUMBERS
+            if not (Inlet(pd,id) in used_inlets)]
+
 @st.composite
 def comm_channel(draw, existing_protection_domains, existing_comm_channels, existing_irq_channels):
-    used_inlets_comm = [inlet for channel in existing_comm_channels for inlet in channel.inlets]
-    used_inlets_irq = [channel.inlet for channel in existing_irq_channels]
-    used_inlets = used_inlets_comm + used_inlets_irq
-    while True:
-        pd1 = draw(st.sampled_from(existing_protection_domains))
-        id1 = draw(legal_inlet_number())
-        if not (Inlet(pd1,id1) in used_inlets):
-            break
-        continue
-    while True:
-        pd2 = draw(st.sampled_from(existing_protection_domains))
-        id2 = draw(legal_inlet_number())
-        if not (Inlet(pd2,id2) in used_inlets):
-            break
-        continue
-    assume(pd1 != pd2)
-    assume(id1 != id2)
-    return CommChannel(frozenset([Inlet(pd1,id1), Inlet(pd2,id2)]))
+    candidates = unused_inlets(existing_protection_domains, existing_comm_channels, existing_irq_channels)
+    assume(candidates)
+    inlet1 = draw(st.sampled_from(candidates))
+    # the second inlet must differ from the first in both its pd and its id
+    candidates = [i for i in candidates
+                  if i.protection_domain != inlet1.protection_domain and i.number != inlet1.number]
+    assume(candidates)
+    inlet2 = draw(st.sampled_from(candidates))
+    return CommChannel((inlet1, inlet2))
 
 @st.composite
 def irq_channel(draw, existing_protection_domains, existing_comm_channels, existing_irq_channels):
-    used_inlets_comm = [inlet for channel in existing_comm_channels for inlet in channel.inlets]
-    used_inlets_irq = [channel.inlet for channel in existing_irq_channels]
-    used_inlets = used_inlets_comm + used_inlets_irq
+    candidates = unused_inlets(existing_protection_domains, existing_comm_channels, existing_irq_channels)
+    assume(candidates)
     used_irqs = [channel.irq for channel in existing_irq_channels]+[0]
-    while True:
-        pd = draw(st.sampled_from(existing_protection_domains))
-        id = draw(legal_inlet_number())
-        if not (Inlet(pd,id) in used_inlets):
-            break
-        continue
-    return IRQChannel(max(used_irqs)+1, Inlet(pd,id))
+    inlet = draw(st.sampled_from(candidates))
+    return IRQChannel(max(used_irqs)+1, inlet)
 
 @st.composite
 def mapped_memory_region(draw, existing_protection_domains, exisiting_memory_regions):
@@ -129,11 +120,8 @@ def preregistry(draw):
         new_irq_channel = draw(irq_channel(existing_protection_domains, existing_comm_channels, existing_irq_channels))
         existing_irq_channels.append(new_irq_channel)
 
-    priority_by_protection_domain = dict()
-    priority_count = 254
-    for pd in existing_protection_domains:
-        priority_by_protection_domain[pd] = priority_count
-        priority_count = priority_count - 1
+    priority_by_protection_domain = \
+      {pd: 254 - index for index, pd in enumerate(existing_protection_domains)}
 
     protection_domains_providing_ppcall = existing_protection_domains[2:]
 
@@ -173,11 +161,8 @@ def registry(draw):
         new_irq_channel = draw(irq_channel(existing_protection_domains, existing_comm_channels, existing_irq_channels))
         existing_irq_channels.append(new_irq_channel)
 
-    priority_by_protection_domain = dict()
-    priority_count = 254
-    for pd in existing_protection_domains:
-        priority_by_protection_domain[pd] = priority_count
-        priority_count = priority_count - 1
+    priority_by_protection_domain = \
+      {pd: 254 - index for index, pd in enumerate(existing_protection_domains)}
 
     protection_domains_providing_ppcall = existing_protection_domains[2:]
 
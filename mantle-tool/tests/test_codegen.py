@@ -36,7 +36,7 @@ def code_gen_should_not_result_in_errors(the_registry):
 
     if not the_registry.protection_domains:
         return
-    the_target = [t for t in the_registry.protection_domains][0]
+    the_target = next(iter(the_registry.protection_domains))
     api = generate_api(the_registry, the_target)
 
     with tempfile.TemporaryDirectory() as tmpdir:
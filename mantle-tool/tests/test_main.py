@@ -0,0 +1,91 @@
+#
+# Copyright 2023, COMAS (ABN 11 932 720 318) and the project contributors
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+from mantle_tool.main import main
+
+VALID_SDF: str = (
+    '<system>\n'
+    '  <protection_domain name="alpha" priority="1" />\n'
+    '  <protection_domain name="beta" priority="2" />\n'
+    '  <channel><end pd="alpha" id="1" /><end pd="beta" id="2" /></channel>\n'
+    '</system>\n')
+
+INVALID_SDF: str = (
+    '<system>\n'
+    '  <protection_domain name="alpha" priority="1" />\n'
+    '  <channel><end pd="alpha" id="1" /><end pd="gamma" id="2" /></channel>\n'
+    '</system>\n')
+
+
+def run_main(*arguments: str) -> int:
+    """Run the command line tool with the given arguments, returning its exit code."""
+    argv = sys.argv
+    sys.argv = ["mantletool", *arguments]
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            main()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = argv
+    return 0
+
+
+def write_file(path: str, contents: str) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(contents)
+    return path
+
+
+def batch_mode_writes_outputs_for_each_input():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = write_file(os.path.join(tmpdir, "first.system"), VALID_SDF)
+        second = write_file(os.path.join(tmpdir, "second.system"), VALID_SDF)
+        output = os.path.join(tmpdir, "{stem}.h")
+        assert run_main("-g", "alpha", "-c", output, first, second) == 0
+        assert sorted(f for f in os.listdir(tmpdir) if f.endswith(".h")) == \
+            ["first.h", "second.h"], "Batch mode must write one output per input."
+batch_mode_writes_outputs_for_each_input()
+
+
+def batch_mode_reports_the_worst_exit_code():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        valid = write_file(os.path.join(tmpdir, "valid.system"), VALID_SDF)
+        invalid = write_file(os.path.join(tmpdir, "invalid.system"), INVALID_SDF)
+        output = os.path.join(tmpdir, "{stem}.h")
+        assert run_main("-g", "alpha", "-c", output, valid, invalid) == 1, \
+            "Batch mode must fail if any input is invalid."
+        assert os.path.exists(os.path.join(tmpdir, "valid.h")), \
+            "Valid inputs must be processed even if others are invalid."
+        assert not os.path.exists(os.path.join(tmpdir, "invalid.h"))
+batch_mode_reports_the_worst_exit_code()
+
+
+def batch_mode_rejects_clashing_outputs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = write_file(os.path.join(tmpdir, "a", "same.system"), VALID_SDF)
+        second = write_file(os.path.join(tmpdir, "b", "same.system"), VALID_SDF)
+        assert run_main("-g", "alpha", "-c", os.path.join(tmpdir, "{stem}.h"), first, second) == 2, \
+            "Inputs with the same stem must be rejected."
+        assert run_main("-g", "alpha", "-c", os.path.join(tmpdir, "out.h"), first, second) == 2, \
+            "Output names without '{stem}' must be rejected in batch mode."
+        assert not any(f.endswith(".h") for f in os.listdir(tmpdir))
+batch_mode_rejects_clashing_outputs()
+
+
+def single_input_keeps_output_name():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sdf = write_file(os.path.join(tmpdir, "single.system"), VALID_SDF)
+        assert run_main("-g", "alpha", "-c", os.path.join(tmpdir, "out_{stem}.h"), sdf) == 0
+        assert sorted(f for f in os.listdir(tmpdir) if f.endswith(".h")) == ["out_{stem}.h"], \
+            "'{stem}' must only be replaced in batch mode."
+single_input_keeps_output_name()
@@ -0,0 +1,175 @@
+#
+# Copyright 2023, COMAS (ABN 11 932 720 318) and the project contributors
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+import mantle_tool.sysxml as sysxml
+from mantle_tool.sysxml import (SystemDescription, xml2system, default_platform_description)
+
+# The XML backends available in this environment: the standard library parser is always
+# available, lxml only when it is installed.
+BACKENDS = [False, True] if sysxml.HAVE_LXML else [False]
+
+
+def parse_with_each_backend(text: str) -> list[Union[SystemDescription, str]]:
+    """
+    Parse the given SDF contents once with each available backend, returning either the
+    resulting SystemDescription or the error message for each one.
+    """
+    have_lxml = sysxml.HAVE_LXML
+    results: list[Union[SystemDescription, str]] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(os.path.join(tmpdir, "test.system"))
+        path.write_text(text)
+        for backend in BACKENDS:
+            sysxml.HAVE_LXML = backend
+            try:
+                results.append(xml2system(path, default_platform_description()))
+            except ValueError as e:
+                results.append(str(e).replace(str(path), "test.system"))
+            finally:
+                sysxml.HAVE_LXML = have_lxml
+    return results
+
+
+def parse_error(text: str) -> str:
+    """The error message reported for the given SDF contents, the same on every backend."""
+    results = parse_with_each_backend(text)
+    assert all(isinstance(r, str) for r in results), "The SDF must be rejected."
+    assert all(r == results[0] for r in results), \
+        f"Every XML backend must report the same error, not {results}."
+    return str(results[0])
+
+
+def parse_success(text: str) -> SystemDescription:
+    """The SystemDescription parsed from the given SDF contents, on every backend."""
+    results = parse_with_each_backend(text)
+    assert all(isinstance(r, SystemDescription) for r in results), \
+        f"The SDF must be accepted, not rejected with {results}."
+    descriptions = [r for r in results if isinstance(r, SystemDescription)]
+    for d in descriptions:
+        assert (d.memory_regions, d.protection_domains, d.channels) == \
+            (descriptions[0].memory_regions, descriptions[0].protection_domains, descriptions[0].channels), \
+            "Every XML backend must produce the same SystemDescription."
+    return descriptions[0]
+
+
+def valid_sdf_parses():
+    sd = parse_success(
+        '<?xml version="1.0"?>\n'
+        '<!-- comment -->\n'
+        '<system>\n'
+        '  <memory_region name="buffer" size="0x1000" />\n'
+        '  <protection_domain name="alpha" priority="10" pp="true">\n'
+        '    <program_image path="alpha.elf" />\n'
+        '    <map mr="buffer" vaddr="0x4000000" setvar_vaddr="buffer_vaddr" />\n'
+        '    <irq irq="33" id="3" />\n'
+        '  </protection_domain>\n'
+        '  <protection_domain name="beta" />\n'
+        '  <channel><end pd="alpha" id="1" /><end pd="beta" id="2" /></channel>\n'
+        '</system>\n')
+    assert [mr.name for mr in sd.memory_regions] == ["buffer"]
+    assert [pd.name for pd in sd.protection_domains] == ["alpha", "beta"]
+    assert [(irq.irq, irq.id_) for irq in sd.protection_domains[0].irqs] == [(33, 3)]
+    assert [channel.ends for channel in sd.channels] == [(("alpha", 1), ("beta", 2))]
+valid_sdf_parses()
+
+
+def internal_entities_are_resolved():
+    sd = parse_success(
+        '<?xml version="1.0"?>\n'
+        '<!DOCTYPE system [ <!ENTITY irq "<irq irq=\'4\' id=\'5\' />"> ]>\n'
+        '<system>\n'
+        '  <protection_domain name="alpha">&irq;</protection_domain>\n'
+        '</system>\n')
+    assert [(irq.irq, irq.id_) for irq in sd.protection_domains[0].irqs] == [(4, 5)], \
+        "Internal entities must be expanded in place."
+internal_entities_are_resolved()
+
+
+def error_locations_include_columns():
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha"><irq irq="1" /></protection_domain>\n'
+        '</system>\n')
+    assert error == "missing required attribute 'id' on element 'irq': test.system:2.34", error
+
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha" colour="red" />\n'
+        '</system>\n')
+    assert error == "invalid attribute 'colour' on element 'protection_domain' @ test.system:2.2", error
+
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha" />text\n'
+        '  <protection_domain name="beta" />\n'
+        '</system>\n')
+    assert error == "unexpected text found after element 'protection_domain' @ test.system:2.2", error
+error_locations_include_columns()
+
+
+def syntax_errors_are_located():
+    assert parse_error("") == "XML parsing: error @ test.system:1.0"
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha">\n'
+        '</system>\n')
+    assert error == "XML parsing: error @ test.system:3.2", error
+syntax_errors_are_located()
+
+
+def external_and_undefined_entities_are_rejected():
+    error = parse_error(
+        '<?xml version="1.0"?>\n'
+        '<!DOCTYPE system [ <!ENTITY irq SYSTEM "irq.xml"> ]>\n'
+        '<system>\n'
+        '  <protection_domain name="alpha">&irq;</protection_domain>\n'
+        '</system>\n')
+    assert error == "XML parsing: error @ test.system:4.34", error
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha">&irq;</protection_domain>\n'
+        '</system>\n')
+    assert error == "XML parsing: error @ test.system:2.34", error
+external_and_undefined_entities_are_rejected()
+
+
+def namespaced_elements_are_rejected():
+    error = parse_error(
+        '<system xmlns="http://example.com/sdf">\n'
+        '  <protection_domain name="alpha" />\n'
+        '</system>\n')
+    assert error == "invalid XML element '{http://example.com/sdf}protection_domain' @ test.system:2.2" \
+        " on element '{http://example.com/sdf}protection_domain' @ test.system:2.2", error
+    error = parse_error(
+        '<system xmlns:sdf="http://example.com/sdf">\n'
+        '  <protection_domain name="alpha" sdf:priority="3" />\n'
+        '</system>\n')
+    assert error == "invalid attribute '{http://example.com/sdf}priority'" \
+        " on element 'protection_domain' @ test.system:2.2", error
+namespaced_elements_are_rejected()
+
+
+def text_in_program_images_is_rejected():
+    error = parse_error(
+        '<system>\n'
+        '  <protection_domain name="alpha"><program_image><foo>bar</foo></program_image></protection_domain>\n'
+        '</system>\n')
+    assert error == "unexpected text found in element 'foo' @ test.system:2.49", error
+text_in_program_images_is_rejected()
+
+
+def out_of_range_channel_ids_are_kept():
+    # such ids are invalid, but they are reported by validation rather than the parser
+    sd = parse_success(
+        '<system>\n'
+        '  <channel><end pd="alpha" id="99999999999999999999" /><end pd="beta" id="-1" /></channel>\n'
+        '</system>\n')
+    assert [channel.ends for channel in sd.channels] == [(("alpha", 99999999999999999999), ("beta", -1))]
+out_of_range_channel_ids_are_kept()
@@ -9,7 +9,7 @@ import hypothesis.strategies as st
 
 from tests.generators import (preregistry, registry)
 from mantle_tool.registry import (ProtectionDomain, Inlet, CommChannel, IRQChannel, MappedMemoryRegion, Registry)
-from mantle_tool.validation import (ValidationError, validation_errors, InvalidInletProtectionDomain, InvalidCommChannelDuplicate, InvalidIRQChannelDuplicate)
+from mantle_tool.validation import (ValidationError, validation_errors, name_validator, InvalidInletProtectionDomain, InvalidCommChannelDuplicate, InvalidIRQChannelDuplicate)
 
 @given(the_registry=registry())
 def randomly_generated_registry_passes_validation(the_registry):
@@ -31,11 +31,10 @@ def invalid_inlet_protection_domain(the_registry):
     # this should trigger an InvalidInletProtectionDomain validation error
     
     verrs = validation_errors(final_registry)
+    # every error must be formattable, not only the expected one
     for verr in verrs:
         verr.format_error()
-        if isinstance(verr, InvalidInletProtectionDomain):
-            return
-    assert False, "Removing a used PD from the registry should trigger an InvalidInletProtectionDomain error."
+    assert any(isinstance(verr, InvalidInletProtectionDomain) for verr in verrs), "Removing a used PD from the registry should trigger an InvalidInletProtectionDomain error."
 invalid_inlet_protection_domain()
 
 
@@ -48,17 +47,16 @@ def invalid_comm_channel_duplicate(the_registry):
     inlet1 = inlet_lists[0][0]
     inlet2 = inlet_lists[1][0]
     # then create a chimera comm channel that uses both
-    new_comm_channel = CommChannel(frozenset([inlet1, inlet2]))
+    new_comm_channel = CommChannel((inlet1, inlet2))
     the_registry.comm_channels.append(new_comm_channel)
     final_registry = the_registry.to_registry()
     # this should trigger an InvalidCommChannelDuplicate validation error
 
     verrs = validation_errors(final_registry)
+    # every error must be formattable, not only the expected one
     for verr in verrs:
         verr.format_error()
-        if isinstance(verr, InvalidCommChannelDuplicate):
-            return
-    assert False, "Using the same inlet in two comm channels should trigger an InvalidCommChannelDuplicate error."
+    assert any(isinstance(verr, InvalidCommChannelDuplicate) for verr in verrs), "Using the same inlet in two comm channels should trigger an InvalidCommChannelDuplicate error."
 invalid_comm_channel_duplicate()
 
 
@@ -80,9 +78,33 @@ def invalid_irq_channel_duplicate(the_registry):
     # this should trigger an InvalidIRQChannelDuplicate validation error
 
     verrs = validation_errors(final_registry)
+    # every error must be formattable, not only the expected one
     for verr in verrs:
         verr.format_error()
-        if isinstance(verr, InvalidIRQChannelDuplicate):
-            return
-    assert False, "Using the same irq in two irq channels should trigger an InvalidIRQChannelDuplicate error."
+    assert any(isinstance(verr, InvalidIRQChannelDuplicate) for verr in verrs), "Using the same irq in two irq channels should trigger an InvalidIRQChannelDuplicate error."
 invalid_irq_channel_duplicate()
+
+
+@given(the_registry=preregistry())
+def validation_errors_compare_by_payload(the_registry):
+    assume(the_registry.inlets)
+
+    # remove a used PD, so that validation reports errors
+    excluded_name = the_registry.inlets[0].protection_domain.name
+    the_registry.protection_domains = \
+      [pd for pd in the_registry.protection_domains if pd.name != excluded_name]
+
+    # two separate registries with the same contents must produce equal errors
+    verrs1 = validation_errors(the_registry.to_registry())
+    verrs2 = validation_errors(the_registry.to_registry())
+    assert verrs1 and verrs1 == verrs2, "Errors must compare by the problem they report, not by their registry."
+    assert set(verrs1) == set(verrs2), "Errors must be hashable, so that they can be deduplicated in a set."
+validation_errors_compare_by_payload()
+
+
+def name_validator_accepts_unicode_letters_and_digits():
+    assert name_validator("café") == frozenset(), "Names may contain non-English letters."
+    assert name_validator("x²") == frozenset(), "Names may contain non-ASCII digits."
+    assert name_validator("_é-1 ") == frozenset({'_', '-', ' '}), "Names must start with a letter."
+    assert name_validator("") == frozenset({' '}), "Names must not be empty."
+name_validator_accepts_unicode_letters_and_digits()